@@ -8,6 +8,8 @@ Uses Kivy's default fonts as fallbacks
 from kivy.core.text import LabelBase
 from kivy.resources import resource_add_path
 import os
+import re
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,13 +19,117 @@ DEFAULT_FONT = 'Roboto'
 LIGHT_FONT = 'Roboto-Light'
 BOLD_FONT = 'Roboto-Bold'
 
+# Font family registered with the regular, light (italic) and bold faces
+FONT_FAMILY = 'BMWFont'
+
+# Cache of resolved font paths, so startup doesn't have to walk the font dirs
+FONT_CACHE_FILE = os.path.expanduser('~/.cache/bmw_id6/fonts.json')
+
 # BMW uses a font similar to 'BMW Type Global Pro'
 # We'll use system fonts that are similar in style
 
-def register_fonts():
+def _font_dir_signature(font_dirs):
     """
-    Register custom fonts for the application.
-    Falls back to default Kivy fonts if custom fonts are not available.
+    Build a signature of the font directories from their mtime and size.
+    
+    Args:
+        font_dirs (list): Font directories to check
+        
+    Returns:
+        dict: Mapping of directory -> [mtime, size], None for missing dirs
+    """
+    signature = {}
+    for font_dir in font_dirs:
+        try:
+            st = os.stat(font_dir)
+            signature[font_dir] = [st.st_mtime, st.st_size]
+        except OSError:
+            signature[font_dir] = None
+    return signature
+
+def _load_font_cache(signature):
+    """
+    Load the cached font mapping if it is still valid.
+    
+    Args:
+        signature (dict): Current font directory signature
+        
+    Returns:
+        dict: Mapping of font name -> font path, or None on cache miss
+    """
+    try:
+        with open(FONT_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if cache.get('dirs') != signature:
+        return None
+    
+    fonts = cache.get('fonts', {})
+    # Drop the cache if any of the cached files have been removed
+    if not all(os.path.isfile(path) for path in fonts.values()):
+        return None
+    
+    return fonts
+
+def _save_font_cache(signature, fonts):
+    """
+    Atomically write the font mapping to the cache file.
+    
+    Args:
+        signature (dict): Font directory signature the mapping is valid for
+        fonts (dict): Mapping of font name -> font path
+    """
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        tmp_file = FONT_CACHE_FILE + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump({'dirs': signature, 'fonts': fonts}, f)
+        os.replace(tmp_file, FONT_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Failed to write font cache: {e}")
+
+def _index_font_files(font_dirs):
+    """
+    Scan the font directories once and index the TTF files found.
+    
+    Args:
+        font_dirs (list): Font directories to scan recursively
+        
+    Returns:
+        dict: Mapping of lowercase file name (without extension) -> font path
+    """
+    font_index = {}
+    # Scan in reverse so that popping from the stack keeps the dir order
+    stack = [font_dir for font_dir in reversed(font_dirs) if os.path.isdir(font_dir)]
+    
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                sub_dirs = []
+                for entry in entries:
+                    # Like os.walk, don't descend into symlinked dirs, which
+                    # could loop back into a parent
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.path)
+                    elif entry.name[-4:].lower() == '.ttf' and entry.is_file():
+                        # Only lowercase the full name for TTF files; most
+                        # entries in the font dirs are other formats
+                        font_index.setdefault(entry.name[:-4].lower(), entry.path)
+                stack.extend(reversed(sub_dirs))
+        except OSError as e:
+            logger.warning(f"Failed to scan font directory: {e}")
+    
+    return font_index
+
+def find_fonts():
+    """
+    Resolve the TTF files to use for the custom fonts.
+    Does not touch Kivy, so it is safe to call from a background thread.
+    
+    Returns:
+        dict: Mapping of font name -> font path for the fonts that were found
     """
     try:
         # Check for system fonts that resemble BMW's font
@@ -35,50 +141,92 @@ def register_fonts():
         
         fonts = {
             'normal': {
-                'name': 'BMWFont',
+                'name': FONT_FAMILY,
                 'alternatives': ['Helvetica', 'Arial', 'Liberation Sans', 'DejaVu Sans']
             },
             'light': {
-                'name': 'BMWFontLight',
+                'name': FONT_FAMILY + 'Light',
                 'alternatives': ['Helvetica Light', 'Arial Light', 'Liberation Sans Light', 'DejaVu Sans Light']
             },
             'bold': {
-                'name': 'BMWFontBold',
+                'name': FONT_FAMILY + 'Bold',
                 'alternatives': ['Helvetica Bold', 'Arial Bold', 'Liberation Sans Bold', 'DejaVu Sans Bold']
             }
         }
         
-        fonts_registered = False
-        
-        # Try to find and register the fonts
-        for font_type, font_info in fonts.items():
-            for alt_font in font_info['alternatives']:
-                found = False
-                
-                for font_dir in system_font_dirs:
-                    # Look for TTF files matching the font name
-                    if os.path.exists(font_dir):
-                        for root, dirs, files in os.walk(font_dir):
-                            for file in files:
-                                if file.lower().startswith(alt_font.lower().replace(' ', '')) and file.lower().endswith('.ttf'):
-                                    font_path = os.path.join(root, file)
-                                    try:
-                                        LabelBase.register(font_info['name'], font_path)
-                                        found = True
-                                        fonts_registered = True
-                                        logger.info(f"Registered font {font_info['name']} using {font_path}")
-                                        break
-                                    except Exception as e:
-                                        logger.warning(f"Failed to register font {font_path}: {e}")
-                            if found:
-                                break
-                    if found:
-                        break
-                if found:
+        # Use the cached font paths if the font directories haven't changed
+        signature = _font_dir_signature(system_font_dirs)
+        cached_fonts = _load_font_cache(signature)
+        if cached_fonts is not None:
+            return cached_fonts
+        
+        resolved_fonts = {}
+        
+        # Index all TTF files once instead of walking the font dirs per alternative
+        font_index = _index_font_files(system_font_dirs)
+        
+        # Match every alternative with one precompiled pattern, longest first
+        # so that e.g. 'Arial Bold' wins over 'Arial' for 'arialbold.ttf'
+        alternatives = sorted(
+            {alt for font_info in fonts.values() for alt in font_info['alternatives']},
+            key=len, reverse=True
+        )
+        pattern = re.compile('^(?:' + '|'.join(
+            f"(?P<alt{i}>" + '[-_ ]?'.join(map(re.escape, alt.lower().split())) + ')'
+            for i, alt in enumerate(alternatives)
+        ) + ')')
+        
+        # First matching file for each alternative, in scan order
+        matches = {}
+        for file_name, font_path in font_index.items():
+            m = pattern.match(file_name)
+            if m:
+                matches.setdefault(alternatives[int(m.lastgroup[3:])], font_path)
+                # Stop scanning once every alternative has been found
+                if len(matches) == len(alternatives):
                     break
         
-        # If no fonts were registered, log a warning
-        if not fonts_registered:
+        # Pick the most preferred alternative that was found
+        for font_info in fonts.values():
+            font_path = next((matches[alt] for alt in font_info['alternatives'] if alt in matches), None)
+            if font_path:
+                resolved_fonts[font_info['name']] = font_path
+        
+        _save_font_cache(signature, resolved_fonts)
+        
+        return resolved_fonts
+    except Exception as e:
+        logger.error(f"Error finding fonts: {e}")
+        return {}
+
+def apply_fonts(font_paths):
+    """
+    Register resolved fonts with Kivy. Must be called from the main thread.
+    
+    Args:
+        font_paths (dict): Mapping of font name -> font path from find_fonts()
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        regular = font_paths.get(FONT_FAMILY)
+        light = font_paths.get(FONT_FAMILY + 'Light')
+        bold = font_paths.get(FONT_FAMILY + 'Bold')
+        
+        # If no fonts were found, log a warning
+        if not (regular or light or bold):
+            logger.warning("Could not register custom fonts, using Kivy defaults")
+            return True
+        
+        # Register one family so 'bold: True' picks the bold face without
+        # switching font_name; the light face is exposed as the italic style
+        try:
+            LabelBase.register(FONT_FAMILY, fn_regular=regular or bold or light,
+                               fn_italic=light, fn_bold=bold)
+            logger.info(f"Registered font {FONT_FAMILY} using {font_paths}")
+        except Exception as e:
+            logger.warning(f"Failed to register font {FONT_FAMILY}: {e}")
             logger.warning("Could not register custom fonts, using Kivy defaults")
         
         return True
@@ -86,5 +234,11 @@ def register_fonts():
         logger.error(f"Error registering fonts: {e}")
         return False
 
-# Call this function when initializing the app
-# register_fonts()
+def register_fonts():
+    """
+    Register custom fonts for the application.
+    Falls back to default Kivy fonts if custom fonts are not available.
+    """
+    return apply_fonts(find_fonts())
+
+# Fonts are found in the background and applied by BMWID6App._load_fonts()
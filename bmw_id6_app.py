@@ -6,6 +6,7 @@ BMW iD6-style App - Main Application Class
 
 import os
 import logging
+import threading
 from kivy.app import App
 from kivy.lang import Builder
 from kivy.uix.screenmanager import ScreenManager, FadeTransition
@@ -18,6 +19,9 @@ from ui.media_player import MediaPlayerScreen
 from ui.navigation import NavigationScreen
 from ui.settings import SettingsScreen
 
+# Import font helpers
+from assets.fonts import find_fonts, apply_fonts
+
 # Import our services
 from services.can_interface import CANInterface
 from services.radio import RadioService
@@ -44,6 +48,11 @@ class BMWID6App(App):
         # UI components
         self.screen_manager = None
         
+        # Look up fonts in the background so the font scan doesn't delay the
+        # first frame; Kivy's default Roboto is used until they are applied
+        self._font_paths = {}
+        threading.Thread(target=self._load_fonts, daemon=True).start()
+        
         # Configure window for simulation environment
         Window.size = (800, 480)  # Common Raspberry Pi touchscreen resolution
         Window.clearcolor = (0, 0, 0, 1)  # Black background
@@ -68,6 +77,16 @@ class BMWID6App(App):
         
         return self.screen_manager
     
+    def _load_fonts(self):
+        """Thread function to find fonts without blocking the UI."""
+        self._font_paths = find_fonts()
+        # LabelBase is not thread-safe, so register on the main thread
+        Clock.schedule_once(self._apply_fonts)
+    
+    def _apply_fonts(self, dt):
+        """Register the fonts found by the background font scan."""
+        apply_fonts(self._font_paths)
+    
     def _init_services(self, dt):
         """Initialize services needed by the app."""
         try:
@@ -81,6 +100,10 @@ class BMWID6App(App):
             # Initialize audio manager
             self.audio_manager = AudioManager()
             
+            # The settings screen shows the service status
+            settings = self.screen_manager.get_screen('settings')
+            settings.attach_services(self.can_interface, self.radio_service)
+            
             # Start vehicle data updates
             Clock.schedule_interval(self._update_vehicle_data, 0.5)  # Update every 500ms
             
@@ -89,15 +112,17 @@ class BMWID6App(App):
     
     def _update_vehicle_data(self, dt):
         """Update vehicle data from CAN bus."""
-        if self.can_interface and self.can_interface.is_connected():
+        # Only the dashboard shows vehicle data, so don't fetch it otherwise
+        if self.screen_manager.current != 'dashboard':
+            return
+        
+        # The CAN thread keeps `connected` current, so read the flag directly
+        if self.can_interface and self.can_interface.connected:
             try:
-                # Get vehicle data
+                # Get vehicle data and update the dashboard
                 vehicle_data = self.can_interface.get_vehicle_data()
-                
-                # Update dashboard if it's the current screen
-                if self.screen_manager.current == 'dashboard':
-                    dashboard = self.screen_manager.get_screen('dashboard')
-                    dashboard.update_vehicle_data(vehicle_data)
+                dashboard = self.screen_manager.get_screen('dashboard')
+                dashboard.update_vehicle_data(vehicle_data)
             except Exception as e:
                 logger.error(f"Error updating vehicle data: {e}")
     
@@ -6,16 +6,31 @@ Raspberry Pi BMW iD6-style Car Head Unit
 Main entry point for the application.
 """
 
+# Use eventlet for Socket.IO when available; it must patch the stdlib
+# before anything else is imported
+try:
+    import eventlet
+    eventlet.monkey_patch()
+except ImportError:
+    eventlet = None
+
 import os
 import sys
 import time
 import logging
-import threading
 import random
+import hashlib
+import itertools
 from datetime import datetime
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, request
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the stdlib json encoder
+
 # Import our services
 from services.bluetooth import BluetoothService
 
@@ -30,9 +45,37 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes responses with orjson."""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+class OrjsonSerializer:
+    """json module replacement that lets Socket.IO encode with orjson."""
+    
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
 # Create Flask app and SocketIO instance
 app = Flask(__name__)
-socketio = SocketIO(app)
+async_mode = 'eventlet' if eventlet else 'threading'
+if orjson:
+    app.json = OrjsonProvider(app)
+    socketio = SocketIO(app, async_mode=async_mode, json=OrjsonSerializer)
+else:
+    socketio = SocketIO(app, async_mode=async_mode)
 
 # Initialize services
 bluetooth_service = BluetoothService()
@@ -59,6 +102,69 @@ radio_data = {
     'is_playing': True
 }
 
+# Cached 'HH:MM' string, refreshed when the minute rolls over
+_time_cache = {'epoch_minute': -1, 'hm': ''}
+
+def current_time_hm():
+    """
+    Get the current time formatted as 'HH:MM'.
+    
+    Returns:
+        str: Current time, formatted at most once per minute
+    """
+    epoch_minute = int(time.time()) // 60
+    if _time_cache['epoch_minute'] != epoch_minute:
+        _time_cache['epoch_minute'] = epoch_minute
+        _time_cache['hm'] = datetime.now().strftime('%H:%M')
+    return _time_cache['hm']
+
+# Serialized API responses with their ETags, by data set name; each entry
+# records the data set's generation it was built from
+_json_cache = {}
+
+# Current generation of each data set, bumped when the data changes. The
+# simulation thread can change the data while a request serializes it, so a
+# response built from an older generation is never reused
+_json_generations = {}
+_json_generation_counter = itertools.count(1)  # next() on a count is atomic
+
+def invalidate_json_cache(name):
+    """
+    Mark the cached API response for a data set as outdated after it changed.
+    
+    Args:
+        name (str): Name of the cached data set
+    """
+    _json_generations[name] = next(_json_generation_counter)
+
+def cached_json_response(name, data):
+    """
+    Build a JSON response for a data set, reusing the cached body and
+    answering with 304 Not Modified if the client already has it.
+    
+    Args:
+        name (str): Name of the cached data set
+        data (dict): Data to serialize on a cache miss
+        
+    Returns:
+        Response: Flask response object
+    """
+    # Read the generation before serializing, so a change during the
+    # serialization leaves the stored entry outdated
+    generation = _json_generations.get(name, 0)
+    cached = _json_cache.get(name)
+    if cached is None or cached[0] != generation:
+        body = app.json.dumps(data)
+        cached = _json_cache[name] = (generation, body, hashlib.sha1(body.encode()).hexdigest())
+    
+    _, body, etag = cached
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
 # Routes
 @app.route('/')
 def index():
@@ -66,25 +172,28 @@ def index():
     return render_template('dashboard.html', 
                           vehicle_data=vehicle_data, 
                           radio_data=radio_data,
-                          time=datetime.now().strftime('%H:%M'),
+                          time=current_time_hm(),
                           outside_temp=vehicle_data['outside_temp'])
 
 @app.route('/phone')
 def phone():
     """Render the BMW iD6 phone interface."""
-    return render_template('phone.html', time=datetime.now().strftime('%H:%M'))
+    return render_template('phone.html', time=current_time_hm())
 
 @app.route('/api/vehicle-data')
 def get_vehicle_data():
     """API endpoint to get current vehicle data."""
     # Add the current time
-    vehicle_data['time'] = datetime.now().strftime('%H:%M')
-    return jsonify(vehicle_data)
+    current_time = current_time_hm()
+    if vehicle_data.get('time') != current_time:
+        vehicle_data['time'] = current_time
+        invalidate_json_cache('vehicle')
+    return cached_json_response('vehicle', vehicle_data)
 
 @app.route('/api/radio-data')
 def get_radio_data():
     """API endpoint to get current radio data."""
-    return jsonify(radio_data)
+    return cached_json_response('radio', radio_data)
 
 # Socket.IO events
 @socketio.on('connect')
@@ -170,39 +279,78 @@ def handle_end_call(data=None):
     else:
         socketio.emit('bluetooth_error', {'message': 'Failed to end call'})
 
+# Last payload sent per tick section, used to skip unchanged broadcasts
+_last_sent = {}
+
+def has_changed(key, payload):
+    """
+    Check whether a payload changed since it was last broadcast.
+    
+    Args:
+        key (str): Name of the tick section
+        payload (dict): Section payload
+        
+    Returns:
+        bool: True if the payload differs from the last broadcast one
+    """
+    # Compare the values directly instead of serializing the payload; a
+    # shallow copy is enough, as nested values are rebuilt for each payload
+    if _last_sent.get(key) == payload:
+        return False
+    
+    _last_sent[key] = dict(payload)
+    return True
+
+# Simulated vehicle fields as (key, min, max, max change per tick); integer
+# steps give integer values, float steps are rounded to one decimal
+SIMULATED_FIELDS = (
+    ('speed', 0, 120, 5),
+    ('rpm', 0, 5000, 100),
+    ('outside_temp', 0, 35, 0.1),
+    ('avg_mpg', 20, 45, 0.2),  # Slow changes to MPG and average speed
+    ('avg_speed', 25, 70, 0.3),
+)
+
 def update_simulated_data():
-    """Background thread to simulate vehicle data updates."""
+    """Background task to simulate vehicle data updates."""
+    randint = random.randint
+    uniform = random.uniform
+    
     while True:
-        # Update vehicle data with small random changes
-        vehicle_data['speed'] = max(0, min(120, vehicle_data['speed'] + random.randint(-5, 5)))
-        vehicle_data['rpm'] = max(0, min(5000, vehicle_data['rpm'] + random.randint(-100, 100)))
-        vehicle_data['outside_temp'] = round(max(0, min(35, vehicle_data['outside_temp'] + random.random() * 0.2 - 0.1)), 1)
-        
-        # Simulate slow changes to MPG and average speed
-        vehicle_data['avg_mpg'] = round(max(20, min(45, vehicle_data['avg_mpg'] + random.random() * 0.4 - 0.2)), 1)
-        vehicle_data['avg_speed'] = round(max(25, min(70, vehicle_data['avg_speed'] + random.random() * 0.6 - 0.3)), 1)
+        # Update vehicle data with small random changes in one table-driven step
+        for key, low, high, step in SIMULATED_FIELDS:
+            if isinstance(step, int):
+                vehicle_data[key] = max(low, min(high, vehicle_data[key] + randint(-step, step)))
+            else:
+                vehicle_data[key] = round(max(low, min(high, vehicle_data[key] + uniform(-step, step))), 1)
+        invalidate_json_cache('vehicle')
         
-        # Emit updates
-        socketio.emit('vehicle_update', vehicle_data)
-        socketio.emit('radio_update', radio_data)
+        # Batch all updates into a single 'tick' event, leaving out the
+        # sections that didn't change since the last tick
+        tick = {}
+        if has_changed('vehicle', vehicle_data):
+            tick['vehicle'] = vehicle_data
+        if has_changed('radio', radio_data):
+            tick['radio'] = radio_data
         
-        # Also emit Bluetooth status periodically
+        # Also send Bluetooth status periodically
         bluetooth_status = bluetooth_service.get_status()
-        socketio.emit('bluetooth_status', bluetooth_status)
+        if has_changed('bluetooth', bluetooth_status):
+            tick['bluetooth'] = bluetooth_status
         
-        # Slow down updates to reduce CPU usage
-        time.sleep(2)
+        if tick:
+            socketio.emit('tick', tick)
+        
+        # Slow down updates to reduce CPU usage (yields to the Socket.IO loop)
+        socketio.sleep(2)
 
 if __name__ == '__main__':
     try:
         logger.info("Starting BMW iD6-style Car Head Unit")
         
-        # Create directories if they don't exist
-        if not os.path.exists('templates'):
-            os.makedirs('templates')
-        
-        if not os.path.exists('static'):
-            os.makedirs('static')
+        # Create directories if they don't exist (one mkdir call each)
+        for directory in ('templates', 'static'):
+            os.makedirs(directory, exist_ok=True)
             
         # Start the Bluetooth service
         bluetooth_service.start()
@@ -210,11 +358,11 @@ if __name__ == '__main__':
         # Connect to the default device (for development convenience)
         bluetooth_service.connect('device1')  # Connect to Pixel 7 Pro
         
-        # Start background thread for simulated data
-        threading.Thread(target=update_simulated_data, daemon=True).start()
+        # Start background task for simulated data
+        socketio.start_background_task(update_simulated_data)
         
         # Start the Flask web application
-        socketio.run(app, host='0.0.0.0', port=5000, debug=True, use_reloader=False, log_output=True)
+        socketio.run(app, host='0.0.0.0', port=5000, debug=False, use_reloader=False, log_output=False)
         
     except Exception as e:
         logger.exception(f"Failed to start application: {e}")
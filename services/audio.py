@@ -9,12 +9,27 @@ import os
 import time
 import threading
 import logging
+import mmap
 import pyaudio
 import wave
 import subprocess
 
+from services.scheduler import default_scheduler
+
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None  # Fall back to amixer if pyalsaaudio isn't installed
+
 logger = logging.getLogger(__name__)
 
+# ALSA mixer channel indices
+MIXER_CHANNEL_LEFT = 0
+MIXER_CHANNEL_RIGHT = 1
+
+# Delay (seconds) used to coalesce volume/balance writes to the mixer
+MIXER_FLUSH_DELAY = 0.03
+
 class AudioManager:
     """
     Manager for audio playback and volume control.
@@ -27,8 +42,23 @@ class AudioManager:
         self.muted = False
         self.playing = False
         self.current_stream = None
+        self._wav_mmap = None
         self.pyaudio_instance = None
         self.simulation_mode = True  # Run in simulation mode without actual audio hardware
+        self._mixer = None
+        # Mixer writes waiting for _flush_mixer(), in the order they were
+        # last requested; balance sets absolute channel levels, so the order
+        # decides whether volume or balance wins, as with immediate writes
+        self._pending_writes = {}
+        self._flush_event = None
+        self._flush_lock = threading.Lock()
+        
+        # Open the ALSA mixer once instead of spawning amixer per change
+        if alsaaudio and os.name == 'posix':
+            try:
+                self._mixer = alsaaudio.Mixer('Master')
+            except alsaaudio.ALSAAudioError as e:
+                logger.warning(f"ALSA mixer not available, using amixer: {e}")
         
         try:
             if not self.simulation_mode:
@@ -60,6 +90,7 @@ class AudioManager:
     def stop(self):
         """Stop audio playback."""
         self.playing = False
+        stream_stopped = True
         
         if self.current_stream:
             try:
@@ -68,39 +99,83 @@ class AudioManager:
                 self.current_stream = None
             except Exception as e:
                 logger.error(f"Error stopping audio stream: {e}")
+                stream_stopped = False
+        
+        # The stream callback may still be reading the mapping if the stream
+        # didn't stop; _teardown_pyaudio() closes it then
+        if stream_stopped:
+            self._close_wav_mmap()
         
         logger.info("Audio playback stopped")
     
     def set_volume(self, volume):
         """
         Set the audio volume.
+        The mixer write is coalesced with other changes in the same
+        MIXER_FLUSH_DELAY window, so slider drags don't hammer ALSA.
         
         Args:
             volume (float): Volume level from 0.0 to 1.0
         """
         self.volume = max(0.0, min(1.0, volume))
+        self._schedule_mixer_flush(self._apply_volume)
         
-        # Apply volume using ALSA if on Linux
-        try:
-            if os.name == 'posix':
-                # Convert 0.0-1.0 to 0-100%
-                volume_percent = int(self.volume * 100)
-                subprocess.run(['amixer', 'sset', 'Master', f'{volume_percent}%'], 
-                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        except Exception as e:
-            logger.error(f"Error setting volume: {e}")
-        
-        logger.info(f"Volume set to {self.volume:.2f}")
+        logger.debug("Volume set to %.2f", self.volume)
     
     def set_balance(self, balance):
         """
         Set the audio balance.
+        The mixer write is coalesced like in set_volume().
         
         Args:
             balance (float): Balance from -1.0 (left) to 1.0 (right)
         """
         self.balance = max(-1.0, min(1.0, balance))
+        self._schedule_mixer_flush(self._apply_balance)
         
+        logger.debug("Balance set to %.2f", self.balance)
+    
+    def _schedule_mixer_flush(self, write):
+        """
+        Queue a mixer write and schedule a flush unless one is already pending.
+        
+        Args:
+            write (callable): _apply_volume or _apply_balance
+        """
+        with self._flush_lock:
+            # Move a repeated write to the end, it now happens after the others
+            self._pending_writes.pop(write, None)
+            self._pending_writes[write] = True
+            
+            if self._flush_event is None:
+                self._flush_event = default_scheduler.enter(MIXER_FLUSH_DELAY, self._flush_mixer)
+    
+    def _flush_mixer(self):
+        """Write the latest volume and balance to the mixer."""
+        with self._flush_lock:
+            self._flush_event = None
+            pending_writes, self._pending_writes = self._pending_writes, {}
+        
+        for write in pending_writes:
+            write()
+    
+    def _apply_volume(self):
+        """Apply the current volume using ALSA."""
+        # Apply volume using ALSA if on Linux
+        try:
+            if os.name == 'posix':
+                # Convert 0.0-1.0 to 0-100%
+                volume_percent = int(self.volume * 100)
+                if self._mixer:
+                    self._mixer.setvolume(volume_percent)
+                else:
+                    subprocess.run(['amixer', 'sset', 'Master', f'{volume_percent}%'], 
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception as e:
+            logger.error(f"Error setting volume: {e}")
+    
+    def _apply_balance(self):
+        """Apply the current balance using ALSA."""
         # Apply balance using ALSA if on Linux
         try:
             if os.name == 'posix':
@@ -112,12 +187,14 @@ class AudioManager:
                     left_volume = int((1.0 - self.balance) * 100)
                     right_volume = 100
                 
-                subprocess.run(['amixer', 'sset', 'Master', f'{left_volume}%,{right_volume}%'], 
-                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                if self._mixer:
+                    self._mixer.setvolume(left_volume, MIXER_CHANNEL_LEFT)
+                    self._mixer.setvolume(right_volume, MIXER_CHANNEL_RIGHT)
+                else:
+                    subprocess.run(['amixer', 'sset', 'Master', f'{left_volume}%,{right_volume}%'], 
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except Exception as e:
             logger.error(f"Error setting balance: {e}")
-        
-        logger.info(f"Balance set to {self.balance:.2f}")
     
     def toggle_mute(self):
         """Toggle mute state."""
@@ -126,7 +203,9 @@ class AudioManager:
         # Apply mute using ALSA if on Linux
         try:
             if os.name == 'posix':
-                if self.muted:
+                if self._mixer:
+                    self._mixer.setmute(1 if self.muted else 0)
+                elif self.muted:
                     subprocess.run(['amixer', 'sset', 'Master', 'mute'], 
                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                 else:
@@ -135,7 +214,7 @@ class AudioManager:
         except Exception as e:
             logger.error(f"Error toggling mute: {e}")
         
-        logger.info(f"Mute {'enabled' if self.muted else 'disabled'}")
+        logger.debug("Mute %s", 'enabled' if self.muted else 'disabled')
     
     def play_audio_file(self, file_path):
         """
@@ -191,12 +270,34 @@ class AudioManager:
             logger.error("PyAudio not initialized")
             return
             
+        # Don't leak the mapping of a previous playback; if its stream couldn't
+        # be stopped, the callback still reads it, and it's closed once the
+        # stream (holding the last reference) is gone
+        if self.current_stream is None:
+            self._close_wav_mmap()
+        self._wav_mmap = None
+        
         try:
-            wf = wave.open(file_path, 'rb')
+            with open(file_path, 'rb') as f:
+                wf = wave.open(f, 'rb')
+                # wave leaves the file positioned at the start of the data chunk
+                data_offset = f.tell()
+                frame_size = wf.getnchannels() * wf.getsampwidth()
+                data_end = data_offset + wf.getnframes() * frame_size
+                # Map the file once and slice it in the callback, instead of
+                # a readframes() call per PortAudio buffer
+                self._wav_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            
+            wav_mmap = self._wav_mmap
+            data_end = min(data_end, len(wav_mmap))
+            pos = data_offset
             
             def callback(in_data, frame_count, time_info, status):
-                data = wf.readframes(frame_count)
-                return (data, pyaudio.paContinue if len(data) > 0 else pyaudio.paComplete)
+                nonlocal pos
+                end = min(pos + frame_count * frame_size, data_end)
+                data = wav_mmap[pos:end]
+                pos = end
+                return (data, pyaudio.paContinue if pos < data_end else pyaudio.paComplete)
             
             self.current_stream = self.pyaudio_instance.open(
                 format=self.pyaudio_instance.get_format_from_width(wf.getsampwidth()),
@@ -212,13 +313,19 @@ class AudioManager:
             logger.error(f"Error playing WAV file: {e}")
     
     def restart(self):
-        """Restart the audio manager."""
-        self.shutdown()
+        """
+        Restart the audio manager.
+        Keeps the PyAudio instance alive, so PortAudio doesn't have to probe
+        the audio devices again; only the current stream is closed.
+        """
+        self.stop()
         
         try:
             if not self.simulation_mode:
-                # Reinitialize PyAudio only if not in simulation mode
-                self.pyaudio_instance = pyaudio.PyAudio()
+                # Initialize PyAudio only if not in simulation mode and if
+                # there isn't an instance to reuse
+                if not self.pyaudio_instance:
+                    self.pyaudio_instance = pyaudio.PyAudio()
                 logger.info("Audio manager restarted with PyAudio")
             else:
                 logger.info("Audio manager restarted in simulation mode")
@@ -229,12 +336,25 @@ class AudioManager:
     def shutdown(self):
         """Shutdown the audio manager and clean up resources."""
         self.stop()
-        
+        self._teardown_pyaudio()
+        logger.info("Audio manager shutdown")
+    
+    def _close_wav_mmap(self):
+        """Close the memory-mapped WAV file of the last playback."""
+        if self._wav_mmap is not None:
+            self._wav_mmap.close()
+            self._wav_mmap = None
+    
+    def _teardown_pyaudio(self):
+        """Terminate the PyAudio instance."""
         if self.pyaudio_instance:
             try:
                 self.pyaudio_instance.terminate()
                 self.pyaudio_instance = None
             except Exception as e:
                 logger.error(f"Error terminating PyAudio: {e}")
-                
-        logger.info("Audio manager shutdown")
+                return
+        
+        # Terminating PyAudio stopped any stream still reading the mapping
+        self.current_stream = None
+        self._close_wav_mmap()
@@ -7,12 +7,26 @@ import time
 import threading
 import logging
 import random
+import collections
+import dataclasses
+from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
+
+from services.scheduler import default_scheduler
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of call history entries to keep
+MAX_CALL_HISTORY = 50
+
+# Average rates (events per second) of the simulated background events
+INCOMING_CALL_RATE = 0.0005 / 5
+BATTERY_DRAIN_RATE = 0.1 / 5
+SIGNAL_CHANGE_RATE = 0.2 / 5
+
 class BluetoothDeviceType(Enum):
     """Types of Bluetooth devices."""
     PHONE = 1
@@ -28,6 +42,63 @@ class CallStatus(Enum):
     HELD = 5
     MISSED = 6
 
+# Enum name lookups used when building status dictionaries
+_DEVICE_TYPE_NAMES = {device_type: device_type.name for device_type in BluetoothDeviceType}
+_CALL_STATUS_NAMES = {status: status.name for status in CallStatus}
+
+@dataclass(slots=True)
+class Contact:
+    """Phone book entry."""
+    id: str
+    name: str
+    number: str
+    
+    def to_dict(self):
+        """Convert to a dictionary for serialization."""
+        return dataclasses.asdict(self)
+
+@dataclass(slots=True)
+class PairedDevice:
+    """Paired Bluetooth device."""
+    id: str
+    name: str
+    type: BluetoothDeviceType
+    battery: int
+    last_connected: float
+    signal: Optional[int] = None  # Only reported by phones
+    
+    def to_dict(self):
+        """Convert to a dictionary for serialization."""
+        info = dataclasses.asdict(self)
+        info["type"] = _DEVICE_TYPE_NAMES[self.type]
+        if self.signal is None:
+            del info["signal"]
+        return info
+
+@dataclass(slots=True)
+class CallRecord:
+    """Current or past phone call."""
+    number: str
+    name: Optional[str]
+    start_time: float
+    duration: float = 0
+    end_time: Optional[float] = None
+    type: Optional[str] = None  # "incoming", "outgoing" or "missed" once ended
+    # time.monotonic() at start_time, for measuring the duration; the wall
+    # clock times above are only for display
+    start_monotonic: Optional[float] = None
+    
+    def to_dict(self):
+        """Convert to a dictionary for serialization."""
+        info = dataclasses.asdict(self)
+        del info["start_monotonic"]
+        # Calls in progress have no end time or type yet
+        if self.end_time is None:
+            del info["end_time"]
+        if self.type is None:
+            del info["type"]
+        return info
+
 class BluetoothService:
     """
     Service for handling Bluetooth connectivity and phone features.
@@ -37,14 +108,16 @@ class BluetoothService:
     def __init__(self):
         """Initialize the Bluetooth service."""
         self.connected = False
-        self.paired_devices = {}  # device_id -> device_info dictionary
+        self.paired_devices = {}  # device_id -> PairedDevice
         self.active_device = None
         self.call_status = CallStatus.IDLE
         self.current_call = None
-        self.call_history = []
+        self.call_history = collections.deque(maxlen=MAX_CALL_HISTORY)
         self.contacts = []
+        self._contacts_by_id = {}  # contact_id -> contact, kept in sync with contacts
         self.running = False
-        self.thread = None
+        self._events = {}  # event name -> pending scheduler event
+        self._events_lock = threading.Lock()
         self._load_sample_data()
         logger.info("Bluetooth service initialized")
     
@@ -54,18 +127,21 @@ class BluetoothService:
             return
         
         self.running = True
-        self.thread = threading.Thread(target=self._bluetooth_thread)
-        self.thread.daemon = True
-        self.thread.start()
+        # Schedule each simulated event for when it next happens, instead of
+        # waking up periodically to roll for it
+        self._schedule_event('incoming_call', INCOMING_CALL_RATE, self._incoming_call_event)
+        self._schedule_event('battery', BATTERY_DRAIN_RATE, self._battery_event)
+        self._schedule_event('signal', SIGNAL_CHANGE_RATE, self._signal_event)
         logger.info("Bluetooth service started")
         return True
     
     def stop(self):
         """Stop the Bluetooth service."""
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=1)
-            self.thread = None
+        with self._events_lock:
+            for event in self._events.values():
+                default_scheduler.cancel(event)
+            self._events.clear()
         logger.info("Bluetooth service stopped")
     
     def get_status(self):
@@ -75,14 +151,23 @@ class BluetoothService:
         Returns:
             dict: Dictionary containing Bluetooth status information
         """
+        device = self.active_device
+        if device:
+            device_name = device.name
+            device_type = device.type
+            battery_level = device.battery
+            signal_strength = device.signal
+        else:
+            device_name = device_type = battery_level = signal_strength = None
+        
         return {
             "connected": self.connected,
-            "device_name": self.active_device.get("name") if self.active_device else None,
-            "device_type": self.active_device.get("type").name if self.active_device and self.active_device.get("type") is not None else None,
-            "battery_level": self.active_device.get("battery") if self.active_device else None,
-            "signal_strength": self.active_device.get("signal") if self.active_device else None,
-            "call_status": self.call_status.name,
-            "current_call": self.current_call
+            "device_name": device_name,
+            "device_type": _DEVICE_TYPE_NAMES[device_type] if device_type is not None else None,
+            "battery_level": battery_level,
+            "signal_strength": signal_strength,
+            "call_status": _CALL_STATUS_NAMES[self.call_status],
+            "current_call": self.current_call.to_dict() if self.current_call else None
         }
     
     def get_paired_devices(self):
@@ -92,7 +177,7 @@ class BluetoothService:
         Returns:
             list: List of paired devices
         """
-        return list(self.paired_devices.values())
+        return [device.to_dict() for device in self.paired_devices.values()]
     
     def connect(self, device_id=None):
         """
@@ -108,14 +193,13 @@ class BluetoothService:
             self.active_device = self.paired_devices[device_id]
         elif not device_id and self.paired_devices:
             # Connect to most recently connected device
-            recent_devices = sorted(self.paired_devices.values(), key=lambda d: d.get("last_connected", 0), reverse=True)
-            self.active_device = recent_devices[0]
+            self.active_device = max(self.paired_devices.values(), key=lambda d: d.last_connected)
         else:
             return False
         
         self.connected = True
-        self.active_device["last_connected"] = time.time()
-        logger.info(f"Connected to {self.active_device['name']}")
+        self.active_device.last_connected = time.time()
+        logger.info(f"Connected to {self.active_device.name}")
         return True
     
     def disconnect(self):
@@ -129,7 +213,7 @@ class BluetoothService:
             return False
         
         # Store name for logging before resetting
-        device_name = self.active_device.get("name", "Unknown device")
+        device_name = self.active_device.name
         self.connected = False
         logger.info(f"Disconnected from {device_name}")
         self.active_device = None
@@ -142,7 +226,7 @@ class BluetoothService:
         Returns:
             list: List of call history entries
         """
-        return self.call_history
+        return [call.to_dict() for call in self.call_history]
     
     def get_contacts(self):
         """
@@ -151,7 +235,7 @@ class BluetoothService:
         Returns:
             list: List of contacts
         """
-        return self.contacts
+        return [contact.to_dict() for contact in self.contacts]
     
     def make_call(self, number=None, contact_id=None):
         """
@@ -171,24 +255,18 @@ class BluetoothService:
         
         # Find contact name if available
         contact_name = None
-        if contact_id:
-            for contact in self.contacts:
-                if contact["id"] == contact_id:
-                    number = contact["number"]
-                    contact_name = contact["name"]
-                    break
+        contact = self._contacts_by_id.get(contact_id) if contact_id else None
+        if contact:
+            number = contact.number
+            contact_name = contact.name
         
-        self.current_call = {
-            "number": number,
-            "name": contact_name,
-            "start_time": time.time(),
-            "duration": 0
-        }
+        self.current_call = CallRecord(number, contact_name, time.time(),
+                                       start_monotonic=time.monotonic())
         
-        logger.info(f"Making call to {contact_name or number}")
+        logger.info("Making call to %s", contact_name or number)
         
         # Simulate call connection
-        threading.Timer(2.0, self._connect_call).start()
+        default_scheduler.enter(2.0, self._connect_call)
         return True
     
     def _connect_call(self):
@@ -208,8 +286,9 @@ class BluetoothService:
             return False
         
         self.call_status = CallStatus.ACTIVE
-        self.current_call["start_time"] = time.time()
-        caller = self.current_call.get('name') or self.current_call.get('number', 'Unknown')
+        self.current_call.start_time = time.time()
+        self.current_call.start_monotonic = time.monotonic()
+        caller = self.current_call.name or self.current_call.number
         logger.info(f"Answered call from {caller}")
         return True
     
@@ -228,12 +307,12 @@ class BluetoothService:
         # Get caller info for logging before we clear current_call
         caller_info = "Unknown caller"
         if self.current_call:
-            caller_info = self.current_call.get('name') or self.current_call.get('number', 'Unknown')
+            caller_info = self.current_call.name or self.current_call.number
             
             # Add to call history
-            self.current_call["end_time"] = time.time()
+            self.current_call.end_time = time.time()
             if self.call_status == CallStatus.ACTIVE:
-                self.current_call["duration"] = self.current_call["end_time"] - self.current_call["start_time"]
+                self.current_call.duration = time.monotonic() - self.current_call.start_monotonic
             
             # Record call type
             if self.call_status == CallStatus.INCOMING:
@@ -243,37 +322,55 @@ class BluetoothService:
             else:
                 call_type = "incoming"
             
-            self.current_call["type"] = call_type
-            self.call_history.insert(0, self.current_call)  # Add to beginning of list
-            
-            # Keep history to a reasonable size
-            if len(self.call_history) > 50:
-                self.call_history = self.call_history[:50]
+            self.current_call.type = call_type
+            # Add to beginning of history; maxlen drops the oldest entry
+            self.call_history.appendleft(self.current_call)
         
         logger.info(f"Ended call with {caller_info}")
         self.call_status = CallStatus.IDLE
         self.current_call = None
         return True
     
-    def _bluetooth_thread(self):
-        """Thread function to handle background Bluetooth tasks."""
-        while self.running:
-            # Simulate occasional incoming call
-            if self.connected and self.call_status == CallStatus.IDLE and random.random() < 0.0005:  # Very low probability
-                self._simulate_incoming_call()
-            
-            # Update battery level and signal strength of connected device
-            if self.connected and self.active_device:
-                # Slowly drain battery
-                if random.random() < 0.1:  # 10% chance each iteration
-                    self.active_device["battery"] = max(0, self.active_device["battery"] - 1)
-                
-                # Fluctuate signal strength
-                if random.random() < 0.2:  # 20% chance each iteration
-                    delta = random.choice([-1, 1])
-                    self.active_device["signal"] = max(0, min(5, self.active_device["signal"] + delta))
+    def _schedule_event(self, name, rate, handler):
+        """
+        Schedule a simulated event after an exponentially distributed delay.
+        
+        Args:
+            name (str): Event name
+            rate (float): Average number of events per second
+            handler (callable): Function to call when the event fires
+        """
+        with self._events_lock:
+            if not self.running:
+                return
             
-            time.sleep(5)  # Sleep to prevent CPU usage
+            self._events[name] = default_scheduler.enter(
+                random.expovariate(rate), self._run_event, name, rate, handler)
+    
+    def _run_event(self, name, rate, handler):
+        """Run a simulated event and schedule its next occurrence."""
+        try:
+            handler()
+        except Exception as e:
+            logger.error(f"Error in Bluetooth {name} event: {e}")
+        
+        self._schedule_event(name, rate, handler)
+    
+    def _incoming_call_event(self):
+        """Simulate occasional incoming call."""
+        if self.connected and self.call_status == CallStatus.IDLE:
+            self._simulate_incoming_call()
+    
+    def _battery_event(self):
+        """Slowly drain the battery of the connected device."""
+        if self.connected and self.active_device:
+            self.active_device.battery = max(0, self.active_device.battery - 1)
+    
+    def _signal_event(self):
+        """Fluctuate the signal strength of the connected device."""
+        if self.connected and self.active_device and self.active_device.signal is not None:
+            delta = random.choice([-1, 1])
+            self.active_device.signal = max(0, min(5, self.active_device.signal + delta))
     
     def _simulate_incoming_call(self):
         """Simulate an incoming call."""
@@ -284,17 +381,13 @@ class BluetoothService:
         contact = random.choice(self.contacts)
         
         self.call_status = CallStatus.INCOMING
-        self.current_call = {
-            "number": contact["number"],
-            "name": contact["name"],
-            "start_time": time.time(),
-            "duration": 0
-        }
+        self.current_call = CallRecord(contact.number, contact.name, time.time(),
+                                       start_monotonic=time.monotonic())
         
-        logger.info(f"Incoming call from {contact['name']}")
+        logger.info("Incoming call from %s", contact.name)
         
         # Auto-miss the call after 15 seconds if not answered
-        threading.Timer(15.0, self._auto_miss_call).start()
+        default_scheduler.enter(15.0, self._auto_miss_call)
     
     def _auto_miss_call(self):
         """Automatically mark a call as missed if not answered."""
@@ -306,14 +399,11 @@ class BluetoothService:
             
             # Add to call history as missed
             if self.current_call:
-                caller_info = self.current_call.get('name') or self.current_call.get('number', 'Unknown')
-                self.current_call["type"] = "missed"
-                self.current_call["end_time"] = time.time()
-                self.call_history.insert(0, self.current_call)
-                
-                # Keep history to a reasonable size
-                if len(self.call_history) > 50:
-                    self.call_history = self.call_history[:50]
+                caller_info = self.current_call.name or self.current_call.number
+                self.current_call.type = "missed"
+                self.current_call.end_time = time.time()
+                # Add to beginning of history; maxlen drops the oldest entry
+                self.call_history.appendleft(self.current_call)
             
             logger.info(f"Missed call from {caller_info}")
             self.current_call = None
@@ -322,65 +412,37 @@ class BluetoothService:
     def _load_sample_data(self):
         """Load sample data for development and testing."""
         # Sample paired devices
+        now = time.time()
         self.paired_devices = {
-            "device1": {
-                "id": "device1",
-                "name": "Pixel 7 Pro",
-                "type": BluetoothDeviceType.PHONE,
-                "battery": 85,
-                "signal": 4,
-                "last_connected": time.time()
-            },
-            "device2": {
-                "id": "device2",
-                "name": "Sony WH-1000XM4",
-                "type": BluetoothDeviceType.AUDIO,
-                "battery": 60,
-                "last_connected": time.time() - 86400  # 1 day ago
-            },
-            "device3": {
-                "id": "device3",
-                "name": "iPhone 14",
-                "type": BluetoothDeviceType.PHONE,
-                "battery": 75,
-                "signal": 3,
-                "last_connected": time.time() - 172800  # 2 days ago
-            }
+            device.id: device for device in (
+                PairedDevice("device1", "Pixel 7 Pro", BluetoothDeviceType.PHONE,
+                             battery=85, signal=4, last_connected=now),
+                PairedDevice("device2", "Sony WH-1000XM4", BluetoothDeviceType.AUDIO,
+                             battery=60, last_connected=now - 86400),  # 1 day ago
+                PairedDevice("device3", "iPhone 14", BluetoothDeviceType.PHONE,
+                             battery=75, signal=3, last_connected=now - 172800)  # 2 days ago
+            )
         }
         
         # Sample contacts
         self.contacts = [
-            {"id": "contact1", "name": "John Smith", "number": "+1 (555) 123-4567"},
-            {"id": "contact2", "name": "Jane Doe", "number": "+1 (555) 987-6543"},
-            {"id": "contact3", "name": "Alice Johnson", "number": "+1 (555) 555-5555"},
-            {"id": "contact4", "name": "Bob Williams", "number": "+1 (555) 444-3333"},
-            {"id": "contact5", "name": "Chris Taylor", "number": "+1 (555) 222-1111"}
+            Contact("contact1", "John Smith", "+1 (555) 123-4567"),
+            Contact("contact2", "Jane Doe", "+1 (555) 987-6543"),
+            Contact("contact3", "Alice Johnson", "+1 (555) 555-5555"),
+            Contact("contact4", "Bob Williams", "+1 (555) 444-3333"),
+            Contact("contact5", "Chris Taylor", "+1 (555) 222-1111")
         ]
+        self._contacts_by_id = {contact.id: contact for contact in self.contacts}
         
         # Sample call history
-        self.call_history = [
-            {
-                "number": "+1 (555) 123-4567",
-                "name": "John Smith",
-                "start_time": time.time() - 3600,  # 1 hour ago
-                "end_time": time.time() - 3500,
-                "duration": 100,
-                "type": "outgoing"
-            },
-            {
-                "number": "+1 (555) 987-6543",
-                "name": "Jane Doe",
-                "start_time": time.time() - 7200,  # 2 hours ago
-                "end_time": time.time() - 7170,
-                "duration": 30,
-                "type": "incoming"
-            },
-            {
-                "number": "+1 (555) 333-2222",
-                "name": "Unknown",
-                "start_time": time.time() - 43200,  # 12 hours ago
-                "end_time": time.time() - 43200,
-                "duration": 0,
-                "type": "missed"
-            }
-        ]
\ No newline at end of file
+        self.call_history = collections.deque([
+            CallRecord("+1 (555) 123-4567", "John Smith",
+                       start_time=now - 3600, end_time=now - 3500,  # 1 hour ago
+                       duration=100, type="outgoing"),
+            CallRecord("+1 (555) 987-6543", "Jane Doe",
+                       start_time=now - 7200, end_time=now - 7170,  # 2 hours ago
+                       duration=30, type="incoming"),
+            CallRecord("+1 (555) 333-2222", "Unknown",
+                       start_time=now - 43200, end_time=now - 43200,  # 12 hours ago
+                       duration=0, type="missed")
+        ], maxlen=MAX_CALL_HISTORY)
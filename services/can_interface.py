@@ -6,49 +6,138 @@ Handles communication with the vehicle's CAN bus
 """
 
 import os
+import socket
 import time
 import threading
+import math
+import random
+import select
 import logging
-import can
-from can.interfaces.socketcan import SocketcanBus
+import struct
+from dataclasses import dataclass, asdict
+import subprocess
+
+try:
+    from pyroute2 import IPRoute
+except ImportError:
+    IPRoute = None  # Fall back to the ip command if pyroute2 isn't installed
+
+from services.scheduler import default_scheduler
 
 logger = logging.getLogger(__name__)
 
+# Layout of a Linux SocketCAN frame (struct can_frame): ID, DLC, padding, data
+_CAN_FRAME = struct.Struct('=IB3x8s')
+
+# Layout of a SocketCAN receive filter (struct can_filter): ID, mask
+_CAN_FILTER = struct.Struct('=II')
+
+# Unpacker for little-endian 16-bit CAN payload fields
+_U16LE = struct.Struct('<H').unpack_from
+
+# Unpacker for the 0x329 payload: little-endian 16-bit RPM followed by the temperature byte
+_RPM_AND_TEMP = struct.Struct('<HB').unpack_from
+
+# Fuel level percentage for each raw fuel byte value
+_FUEL_LEVEL_TABLE = [int(fuel_raw * 0.392) for fuel_raw in range(256)]
+
+# Outside temperature in degrees C for each raw temperature byte value
+_OUTSIDE_TEMP_TABLE = [(temp_raw - 128) * 0.5 for temp_raw in range(256)]
+
+# Requested CAN socket receive buffer size in bytes, so bursts of frames
+# aren't dropped while the reader thread is held up
+RX_BUFFER_SIZE = 4 * 1024 * 1024
+
+# SO_RCVBUFFORCE (Linux) isn't exported by the socket module
+_SO_RCVBUFFORCE = getattr(socket, 'SO_RCVBUFFORCE', 33)
+
+# Seconds without CAN messages before the interface counts as disconnected
+CONNECTION_TIMEOUT = 5
+
+# Milliseconds the reader waits for frames before re-checking the connection
+READ_POLL_TIMEOUT_MS = 1000
+
+@dataclass(slots=True)
+class VehicleData:
+    """Vehicle data decoded from the CAN bus."""
+    speed: int = 0
+    rpm: int = 0
+    fuel_level: float = 0
+    coolant_temp: int = 0
+    outside_temp: float = 20
+    engine_on: bool = False
+    
+    def copy(self):
+        """Return a copy to apply updates to before publishing it."""
+        return VehicleData(self.speed, self.rpm, self.fuel_level, self.coolant_temp,
+                           self.outside_temp, self.engine_on)
+    
+    def to_dict(self):
+        """Convert to a dictionary for serialization."""
+        return asdict(self)
+
+def _next_event_iteration(iteration, probability):
+    """
+    Draw the iteration of the next event that has a fixed chance per iteration.
+    
+    Args:
+        iteration (int): Current iteration
+        probability (float): Chance of the event happening in one iteration
+        
+    Returns:
+        int: Iteration in which the event happens next (geometric distribution)
+    """
+    return iteration + 1 + int(random.expovariate(-math.log1p(-probability)))
+
 class CANInterface:
     """
     Interface for communicating with the vehicle's CAN bus.
-    Uses python-can library to interface with SocketCAN.
+    Reads frames from a raw SocketCAN socket, or simulates them.
     """
     
-    def __init__(self, channel='can0', bitrate=500000):
+    def __init__(self, channel='can0', bitrate=500000, simulate=True):
         """
         Initialize the CAN interface.
         
         Args:
             channel (str): CAN interface channel (default: 'can0')
-            bitrate (int): CAN bitrate in bps (default: 500000)
+            bitrate (int): CAN bitrate in bps (default: 500000). Applied to the
+                interface when starting, which requires CAP_NET_ADMIN.
+            simulate (bool): Simulate vehicle data instead of reading the CAN bus
+                (default: True)
         """
         self.channel = channel
         self.bitrate = bitrate
-        self.bus = None
+        self.simulate = simulate
+        self.socket = None
         self.running = False
         self.connected = False
+        self._status_listeners = []  # Called when `connected` changes
         self.thread = None
-        self.vehicle_data = {
-            'speed': 0,
-            'rpm': 0,
-            'fuel_level': 0,
-            'coolant_temp': 0,
-            'outside_temp': 20,
-            'engine_on': False
+        self._simulation_event = None
+        self.vehicle_data = VehicleData()  # Published snapshot, see _publish_vehicle_data()
+        self.last_received = 0  # time.monotonic(); the reader thread keeps `connected` up to date
+        
+        # Decoders for the CAN IDs we're interested in
+        self._decoders = {
+            0x316: self._decode_speed,
+            0x329: self._decode_rpm_and_temp,
+            0x349: self._decode_fuel,
+            0x410: self._decode_outside_temp
         }
-        self.last_received = 0
+        
+        # Formatted arbitration IDs for logging, the set of IDs in use is small
+        self._arb_id_strs = {}
         
     def start(self):
         """Start the CAN interface and begin reading data."""
         if self.running:
             logger.warning("CAN interface already running")
             return
+        
+        if not self.simulate:
+            self._start_reader()
+            return
             
         logger.info(f"Starting CAN interface in simulation mode")
         
@@ -56,29 +145,96 @@ class CANInterface:
             # For testing/simulation, we'll run in simulation mode
             # without actual CAN hardware
             self.running = True
-            self.connected = True
-            self.last_received = time.time()
+            self._set_connected(True)
+            self.last_received = time.monotonic()
             
             # Set initial simulated vehicle data
-            self.vehicle_data = {
-                'speed': 45,
-                'rpm': 1500,
-                'fuel_level': 75,
-                'coolant_temp': 90,
-                'outside_temp': 22,
-                'engine_on': True
-            }
+            self._publish_vehicle_data(VehicleData(
+                speed=45,
+                rpm=1500,
+                fuel_level=75,
+                coolant_temp=90,
+                outside_temp=22,
+                engine_on=True
+            ))
             
-            # Start the simulation thread
-            self.thread = threading.Thread(target=self._simulate_can_messages)
-            self.thread.daemon = True
-            self.thread.start()
+            # Run the simulation on the shared scheduler thread
+            self._run_simulation(self._simulate_can_messages())
             
             logger.info("CAN interface simulation started successfully")
             
         except Exception as e:
             logger.error(f"Error starting CAN interface simulation: {e}")
-            self.connected = False
+            self._set_connected(False)
+    
+    def _start_reader(self):
+        """Open the CAN socket and start the reader thread."""
+        logger.info(f"Starting CAN interface on {self.channel}")
+        self._configure_interface()
+        
+        try:
+            self.socket = socket.socket(socket.AF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
+            # Let the kernel drop the frames we have no decoder for, and our own
+            # sent frames, so they never wake up the reader thread
+            # (the mask includes the EFF/RTR flags to match only standard data frames)
+            mask = socket.CAN_SFF_MASK | socket.CAN_EFF_FLAG | socket.CAN_RTR_FLAG
+            filters = b''.join(_CAN_FILTER.pack(arb_id, mask) for arb_id in self._decoders)
+            self.socket.setsockopt(socket.SOL_CAN_RAW, socket.CAN_RAW_FILTER, filters)
+            self.socket.setsockopt(socket.SOL_CAN_RAW, socket.CAN_RAW_RECV_OWN_MSGS, 0)
+            self._set_receive_buffer()
+            self.socket.bind((self.channel,))
+            self.socket.setblocking(False)  # The reader waits in poll() instead
+            
+            self.running = True
+            self.thread = threading.Thread(target=self._read_can_messages)
+            self.thread.daemon = True
+            self.thread.start()
+            
+            logger.info("CAN interface started successfully")
+            
+        except Exception as e:
+            logger.error(f"Error starting CAN interface: {e}")
+            if self.socket:
+                self.socket.close()
+                self.socket = None
+            self.running = False
+            self._set_connected(False)
+    
+    def _set_receive_buffer(self):
+        """Enlarge the CAN socket receive buffer to RX_BUFFER_SIZE."""
+        try:
+            # Goes beyond the net.core.rmem_max limit, but needs CAP_NET_ADMIN
+            self.socket.setsockopt(socket.SOL_SOCKET, _SO_RCVBUFFORCE, RX_BUFFER_SIZE)
+        except OSError:
+            # The kernel caps this to net.core.rmem_max
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RX_BUFFER_SIZE)
+        
+        logger.debug("CAN receive buffer size: %d bytes",
+                     self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF))
+    
+    def _configure_interface(self):
+        """Set the bitrate of the CAN interface and bring it up."""
+        try:
+            if IPRoute:
+                # Talk netlink directly instead of spawning processes
+                with IPRoute() as ipr:
+                    index = ipr.link_lookup(ifname=self.channel)[0]
+                    ipr.link('set', index=index, state='down')
+                    ipr.link('set', index=index, kind='can',
+                             can_bittiming={'bitrate': self.bitrate})
+                    ipr.link('set', index=index, state='up')
+            else:
+                # Argument lists without a shell, so the channel name can't inject commands
+                subprocess.run(['ip', 'link', 'set', self.channel, 'down'], check=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                subprocess.run(['ip', 'link', 'set', self.channel, 'type', 'can',
+                                'bitrate', str(self.bitrate)], check=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                subprocess.run(['ip', 'link', 'set', self.channel, 'up'], check=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception as e:
+            # The interface may have been configured by the system already
+            logger.warning(f"Could not configure CAN interface {self.channel}: {e}")
     
     def stop(self):
         """Stop the CAN interface."""
@@ -89,16 +245,21 @@ class CANInterface:
         
         self.running = False
         
+        if self._simulation_event:
+            default_scheduler.cancel(self._simulation_event)
+            self._simulation_event = None
+        
         if self.thread:
-            self.thread.join(timeout=1.0)
+            self.thread.join(timeout=READ_POLL_TIMEOUT_MS / 1000 + 0.5)
             
-        if self.bus:
+        if self.socket:
             try:
-                self.bus.shutdown()
+                self.socket.close()
             except Exception as e:
-                logger.error(f"Error shutting down CAN bus: {e}")
+                logger.error(f"Error closing CAN socket: {e}")
+            self.socket = None
                 
-        self.connected = False
+        self._set_connected(False)
         logger.info("CAN interface stopped")
     
     def is_connected(self):
@@ -108,123 +269,223 @@ class CANInterface:
         Returns:
             bool: True if connected, False otherwise
         """
-        # Check if we've received any messages recently (within 5 seconds)
-        if self.connected and time.time() - self.last_received > 5:
-            self.connected = False
-            
+        # The reader thread clears the flag after CONNECTION_TIMEOUT without
+        # messages and the simulation keeps it set, so no clock read is needed
         return self.connected
     
+    def add_status_listener(self, callback):
+        """
+        Register a callback for connection status changes.
+        
+        Args:
+            callback (callable): Called without arguments after `connected`
+                changed, from the thread that changed it
+        """
+        self._status_listeners.append(callback)
+    
+    def _set_connected(self, connected):
+        """Update the connected flag and notify the status listeners of changes."""
+        if connected == self.connected:
+            return
+        
+        self.connected = connected
+        for callback in self._status_listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in CAN status listener: {e}")
+    
     def get_vehicle_data(self):
         """
         Get the latest vehicle data.
         
         Returns:
-            dict: Dictionary containing vehicle data
+            VehicleData: Snapshot of the vehicle data (shared, do not modify)
         """
-        return self.vehicle_data.copy()
+        # Writers publish a new snapshot instead of mutating this one, so it
+        # can be handed out without copying
+        return self.vehicle_data
+    
+    def _publish_vehicle_data(self, vehicle_data):
+        """
+        Publish updated vehicle data to readers.
+        
+        Args:
+            vehicle_data (VehicleData): New vehicle data, must not be modified afterwards
+        """
+        # A single (atomic) rebind, so readers never see a half-updated snapshot
+        self.vehicle_data = vehicle_data
     
     def _read_can_messages(self):
         """Thread function to continuously read CAN messages."""
+        # Frames are received into one preallocated buffer and unpacked in place,
+        # without building a message object per frame
+        sock = self.socket
+        frame = bytearray(_CAN_FRAME.size)
+        unpack_frame = _CAN_FRAME.unpack_from
+        
+        # Sleep in poll() until frames arrive, then drain all of them in one wakeup
+        poller = select.poll()
+        poller.register(sock, select.POLLIN)
+        
         while self.running:
             try:
-                # Read a message with timeout
-                message = self.bus.recv(timeout=0.5)
+                if not poller.poll(READ_POLL_TIMEOUT_MS):
+                    if self.connected and time.monotonic() - self.last_received > CONNECTION_TIMEOUT:
+                        # Keep the connected flag current so readers don't have to poll
+                        self._set_connected(False)
+                    continue
+                
+                # All frames of one drain are decoded into a single working
+                # copy, which is published once the socket is drained
+                vehicle_data = None
+                
+                while self.running:
+                    try:
+                        if sock.recv_into(frame) < _CAN_FRAME.size:
+                            continue
+                    except BlockingIOError:
+                        break  # Drained
+                    
+                    if vehicle_data is None:
+                        vehicle_data = self.vehicle_data.copy()
+                    
+                    can_id, dlc, data = unpack_frame(frame)
+                    self._process_can_message(can_id & socket.CAN_EFF_MASK, data[:dlc], vehicle_data)
                 
-                if message:
-                    self.last_received = time.time()
-                    self._process_can_message(message)
+                if vehicle_data is not None:
+                    self._publish_vehicle_data(vehicle_data)
+                    
+                    # Read the clock once per drain rather than per frame
+                    self.last_received = time.monotonic()
+                    self._set_connected(True)
                     
             except Exception as e:
                 logger.error(f"Error reading CAN message: {e}")
-                self.connected = False
+                self._set_connected(False)
                 time.sleep(1.0)  # Wait before retrying
                 
+    def _run_simulation(self, simulation):
+        """
+        Advance the CAN simulation by one step and schedule the next one.
+        
+        Args:
+            simulation: Generator from _simulate_can_messages()
+        """
+        if not self.running:
+            return
+        
+        try:
+            delay = next(simulation)
+        except StopIteration:
+            return
+        
+        self._simulation_event = default_scheduler.enter(delay, self._run_simulation, simulation)
+    
     def _simulate_can_messages(self):
-        """Thread function to simulate CAN messages for testing."""
-        import random
+        """
+        Generator to simulate CAN messages for testing.
+        Yields the delay until the next step, see _run_simulation().
+        """
+        # Rare events are scheduled for the iteration they next happen in,
+        # instead of rolling random() for them on every iteration
+        iteration = 0
+        next_fuel_drop = _next_event_iteration(iteration, 0.01)
+        next_temp_change = _next_event_iteration(iteration, 0.05)
+        
+        # Bind the random functions to locals once for the whole simulation
+        randint = random.randint
+        uniform = random.uniform
         
         while self.running:
             try:
                 # Update the timestamp for connection status
-                self.last_received = time.time()
+                self.last_received = time.monotonic()
+                
+                # Work on a copy so readers never see a half-updated snapshot
+                vehicle_data = self.vehicle_data.copy()
                 
                 # Simulate speed changes (with some randomness)
-                self.vehicle_data['speed'] += random.randint(-3, 3)
-                self.vehicle_data['speed'] = max(0, min(120, self.vehicle_data['speed']))
+                vehicle_data.speed += randint(-3, 3)
+                vehicle_data.speed = max(0, min(120, vehicle_data.speed))
                 
                 # Simulate RPM changes based on speed
-                target_rpm = self.vehicle_data['speed'] * 30 + 800  # Simplified RPM calculation
-                self.vehicle_data['rpm'] += (target_rpm - self.vehicle_data['rpm']) // 10
-                self.vehicle_data['rpm'] = max(800, min(6000, self.vehicle_data['rpm']))
+                target_rpm = vehicle_data.speed * 30 + 800  # Simplified RPM calculation
+                vehicle_data.rpm += (target_rpm - vehicle_data.rpm) // 10
+                vehicle_data.rpm = max(800, min(6000, vehicle_data.rpm))
+                
+                iteration += 1
                 
                 # Gradually decrease fuel level
-                if random.random() < 0.01:  # 1% chance per iteration
-                    self.vehicle_data['fuel_level'] -= 0.1
-                    self.vehicle_data['fuel_level'] = max(0, self.vehicle_data['fuel_level'])
+                if iteration == next_fuel_drop:  # 1% chance per iteration
+                    next_fuel_drop = _next_event_iteration(iteration, 0.01)
+                    vehicle_data.fuel_level -= 0.1
+                    vehicle_data.fuel_level = max(0, vehicle_data.fuel_level)
                 
                 # Simulate coolant temperature fluctuations
-                self.vehicle_data['coolant_temp'] += random.randint(-1, 1)
-                self.vehicle_data['coolant_temp'] = max(80, min(105, self.vehicle_data['coolant_temp']))
+                vehicle_data.coolant_temp += randint(-1, 1)
+                vehicle_data.coolant_temp = max(80, min(105, vehicle_data.coolant_temp))
                 
                 # Simulate outside temperature changes
-                if random.random() < 0.05:  # 5% chance per iteration
-                    self.vehicle_data['outside_temp'] += random.uniform(-0.1, 0.1)
-                    self.vehicle_data['outside_temp'] = round(self.vehicle_data['outside_temp'], 1)
+                if iteration == next_temp_change:  # 5% chance per iteration
+                    next_temp_change = _next_event_iteration(iteration, 0.05)
+                    vehicle_data.outside_temp += uniform(-0.1, 0.1)
+                    vehicle_data.outside_temp = round(vehicle_data.outside_temp, 1)
+                
+                self._publish_vehicle_data(vehicle_data)
                 
-                # Sleep to simulate update rate
-                time.sleep(0.2)
+                # Wait to simulate update rate
+                yield 0.2
                 
             except Exception as e:
                 logger.error(f"Error in CAN simulation: {e}")
-                time.sleep(1.0)
+                yield 1.0
     
-    def _process_can_message(self, message):
+    def _process_can_message(self, arb_id, data, vehicle_data):
         """
         Process a CAN message and update vehicle data.
         
         Args:
-            message: CAN message object
+            arb_id (int): Arbitration ID
+            data (bytes): Message data
+            vehicle_data (VehicleData): Unpublished working copy to decode into
         """
         try:
             # Here we would have actual CAN ID mapping for the specific vehicle
             # This is a simplified example - real implementation would depend on
             # the specific vehicle's CAN protocol
-            
-            # Example: Speed data on ID 0x316 (BMW)
-            if message.arbitration_id == 0x316:
-                # Convert data to speed value (BMW specific)
-                speed_raw = (message.data[1] << 8) | message.data[0]
-                speed_kph = speed_raw * 0.01  # Scale factor depends on vehicle
-                self.vehicle_data['speed'] = int(speed_kph)
-            
-            # Example: RPM data on ID 0x329 (BMW)
-            elif message.arbitration_id == 0x329:
-                # Convert data to RPM value
-                rpm_raw = (message.data[1] << 8) | message.data[0]
-                rpm = rpm_raw * 0.25  # Scale factor depends on vehicle
-                self.vehicle_data['rpm'] = int(rpm)
-            
-            # Example: Engine temperature on ID 0x329 (BMW)
-            elif message.arbitration_id == 0x329:
-                temp_raw = message.data[2]
-                temp_c = temp_raw - 40  # Offset depends on vehicle
-                self.vehicle_data['coolant_temp'] = temp_c
-            
-            # Example: Fuel level on ID 0x349 (BMW)
-            elif message.arbitration_id == 0x349:
-                fuel_raw = message.data[0]
-                fuel_percent = fuel_raw * 0.392  # Scale factor depends on vehicle
-                self.vehicle_data['fuel_level'] = int(fuel_percent)
-            
-            # Example: Outside temperature on ID 0x410 (BMW)
-            elif message.arbitration_id == 0x410:
-                temp_raw = message.data[3]
-                temp_c = (temp_raw - 128) * 0.5  # Conversion depends on vehicle
-                self.vehicle_data['outside_temp'] = temp_c
+            decoder = self._decoders.get(arb_id)
+            if decoder:
+                decoder(data, vehicle_data)
             
         except Exception as e:
             logger.error(f"Error processing CAN message: {e}")
     
+    def _decode_speed(self, data, vehicle_data):
+        """Example: Speed data on ID 0x316 (BMW)."""
+        # Convert data to speed value (BMW specific)
+        speed_raw, = _U16LE(data, 0)
+        # Scale factor (0.01) depends on vehicle; integer math avoids floats
+        vehicle_data.speed = speed_raw // 100
+    
+    def _decode_rpm_and_temp(self, data, vehicle_data):
+        """Example: RPM and engine temperature data on ID 0x329 (BMW)."""
+        # Both fields come out of a single unpack call
+        rpm_raw, temp_raw = _RPM_AND_TEMP(data, 0)
+        # Scale factor (0.25) depends on vehicle
+        vehicle_data.rpm = rpm_raw >> 2
+        vehicle_data.coolant_temp = temp_raw - 40  # Offset depends on vehicle
+    
+    def _decode_fuel(self, data, vehicle_data):
+        """Example: Fuel level on ID 0x349 (BMW)."""
+        # Scale factor (0.392) depends on vehicle, see _FUEL_LEVEL_TABLE
+        vehicle_data.fuel_level = _FUEL_LEVEL_TABLE[data[0]]
+    
+    def _decode_outside_temp(self, data, vehicle_data):
+        """Example: Outside temperature on ID 0x410 (BMW)."""
+        # Conversion depends on vehicle, see _OUTSIDE_TEMP_TABLE
+        vehicle_data.outside_temp = _OUTSIDE_TEMP_TABLE[data[3]]
+    
     def send_message(self, arb_id, data):
         """
         Send a CAN message.
@@ -241,16 +502,18 @@ class CANInterface:
             return False
             
         try:
-            # In simulation mode, just log the message
-            logger.info(f"Simulation: CAN message sent with ID: 0x{arb_id:x}, data: {data.hex() if data else 'None'}")
+            if self.socket:
+                self.socket.send(_CAN_FRAME.pack(arb_id, len(data), data))
+                return True
             
-            # In real mode with hardware, this would be:
-            # message = can.Message(
-            #     arbitration_id=arb_id,
-            #     data=data,
-            #     is_extended_id=False
-            # )
-            # self.bus.send(message)
+            # In simulation mode, just log the message
+            # Skip formatting (and data.hex()) entirely when INFO is disabled
+            if logger.isEnabledFor(logging.INFO):
+                id_str = self._arb_id_strs.get(arb_id)
+                if id_str is None:
+                    id_str = self._arb_id_strs[arb_id] = f"0x{arb_id:x}"
+                logger.info("Simulation: CAN message sent with ID: %s, data: %s",
+                            id_str, data.hex() if data else 'None')
             
             return True
         except Exception as e:
@@ -6,19 +6,87 @@ Handles DAB and FM radio reception with RDS
 """
 
 import os
-import time
+import bisect
+import itertools
 import threading
 import logging
+import random
 import subprocess
-from enum import Enum
+import types
+from enum import IntEnum
+
+from services.scheduler import default_scheduler
 
 logger = logging.getLogger(__name__)
 
-class RadioMode(Enum):
+# Seconds between checks of the radio process and signal strength updates
+MONITOR_INTERVAL = 1.0
+
+# Seconds between simulated RDS text changes
+RDS_TEXT_INTERVAL = 10.0
+
+# Seconds a terminated radio process gets to exit before it is killed
+PROCESS_STOP_TIMEOUT = 2.0
+
+# Seconds between checks whether a terminated radio process has exited
+PROCESS_REAP_INTERVAL = 0.1
+
+# Simulated RDS texts, formatted with the station name
+_RDS_TEXT_TEMPLATES = (
+    "You're listening to {station}",
+    "{station} - Your Music Station",
+    "Text us at 12345",
+    "Follow us on social media",
+    "{station} - No commercials"
+)
+
+# Simulated FM station names by frequency (MHz)
+# In real implementation, this would come from RDS data
+_FM_STATION_NAMES = {
+    87.9: "ROCK FM",
+    88.5: "CLASSIC HITS",
+    89.1: "NEWS 24/7",
+    91.3: "SMOOTH JAZZ",
+    93.5: "TOP 40",
+    95.7: "COUNTRY",
+    97.9: "TALK RADIO",
+    99.1: "HIP HOP",
+    101.3: "CLASSICAL",
+    103.5: "ALTERNATIVE",
+    105.7: "OLDIES",
+    107.9: "POP HITS"
+}
+
+# Sorted station frequencies, for looking up the closest one with bisect
+_FM_STATION_FREQS = sorted(_FM_STATION_NAMES)
+
+def _closest_fm_station_freq(frequency):
+    """
+    Find the simulated FM station closest to a frequency.
+    
+    Args:
+        frequency (float): FM frequency in MHz
+        
+    Returns:
+        float: Frequency of the closest station
+    """
+    i = bisect.bisect_left(_FM_STATION_FREQS, frequency)
+    if i == 0:
+        return _FM_STATION_FREQS[0]
+    if i == len(_FM_STATION_FREQS):
+        return _FM_STATION_FREQS[-1]
+    
+    below, above = _FM_STATION_FREQS[i - 1], _FM_STATION_FREQS[i]
+    return below if frequency - below <= above - frequency else above
+
+class RadioMode(IntEnum):
     """Radio mode enumeration."""
     FM = 1
     DAB = 2
 
+# Radio modes by name, as passed to set_mode()
+_RADIO_MODES = {mode.name: mode for mode in RadioMode}
+
 class RadioService:
     """
     Service for handling DAB and FM radio reception with RDS.
@@ -29,15 +97,24 @@ class RadioService:
         """Initialize the radio service."""
         self.mode = RadioMode.DAB
         self.frequency = 95.5  # Default FM frequency (MHz)
+        self._frequency_str = "95.50 MHz"  # Display string, see _update_frequency()
         self.current_station = "No Station"
         self.rds_text = ""
         self.signal_strength = 0
         self.running = False
         self.active = False
-        self.thread = None
+        self._status_listeners = []  # Called when `active` changes
         self.process = None
+        self._events = {}  # event name -> pending scheduler event
+        self._events_lock = threading.Lock()
         self.station_list = []
         self.current_station_index = 0
+        # The radio state changes on the scheduler thread while the UI reads
+        # it, so the get_current_info() result is cached with the state
+        # version it was built from, rather than cleared on changes
+        self._info_versions = itertools.count()  # next() on a count is atomic
+        self._info_version = next(self._info_versions)
+        self._info_cache = None  # (state version, get_current_info() result)
         
     def start(self):
         """Start the radio service."""
@@ -49,29 +126,33 @@ class RadioService:
         
         try:
             self.running = True
-            self.active = True
+            self._set_active(True)
             
             # For simulation mode, set up some initial values
             if self.mode == RadioMode.FM:
                 self.current_station = "Simulation Radio 1"
-                self.frequency = 98.8
+                self._update_frequency(98.8)
                 self.rds_text = "Welcome to Simulation FM Radio"
             else:
                 self.current_station = "DAB Simulation 1"
                 self.rds_text = "Digital Radio Simulation"
                 
             self.signal_strength = 85  # Simulate good signal
+            self._invalidate_info()
+            
+            # Initial scan for stations and start radio reception
+            self._scan_stations()
+            self._start_reception()
             
-            # Start the radio simulation thread
-            self.thread = threading.Thread(target=self._radio_thread)
-            self.thread.daemon = True
-            self.thread.start()
+            # Periodic updates run on the shared scheduler thread
+            self._schedule_event('monitor', MONITOR_INTERVAL, self._monitor_event)
+            self._schedule_event('rds_text', RDS_TEXT_INTERVAL, self._rds_text_event)
             
             logger.info("Radio service simulation started successfully")
             
         except Exception as e:
             logger.error(f"Error starting radio service: {e}")
-            self.active = False
+            self._set_active(False)
     
     def stop(self):
         """Stop the radio service."""
@@ -80,19 +161,15 @@ class RadioService:
             
         logger.info("Stopping radio service")
         
-        self.running = False
+        with self._events_lock:
+            self.running = False
+            for event in self._events.values():
+                default_scheduler.cancel(event)
+            self._events.clear()
         
-        if self.process:
-            try:
-                self.process.terminate()
-                self.process.wait(timeout=2.0)
-            except Exception as e:
-                logger.error(f"Error terminating radio process: {e}")
-                
-        if self.thread:
-            self.thread.join(timeout=1.0)
+        self._stop_process()
                 
-        self.active = False
+        self._set_active(False)
         logger.info("Radio service stopped")
     
     def is_active(self):
@@ -104,6 +181,28 @@ class RadioService:
         """
         return self.active
     
+    def add_status_listener(self, callback):
+        """
+        Register a callback for status changes.
+        
+        Args:
+            callback (callable): Called without arguments after `active`
+                changed, from the thread that changed it
+        """
+        self._status_listeners.append(callback)
+    
+    def _set_active(self, active):
+        """Update the active flag and notify the status listeners of changes."""
+        if active == self.active:
+            return
+        
+        self.active = active
+        for callback in self._status_listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in radio status listener: {e}")
+    
     def set_mode(self, mode):
         """
         Set the radio mode (FM or DAB).
@@ -111,22 +210,17 @@ class RadioService:
         Args:
             mode (str): 'FM' or 'DAB'
         """
-        if mode == 'FM':
-            self.mode = RadioMode.FM
-        elif mode == 'DAB':
-            self.mode = RadioMode.DAB
-        else:
+        radio_mode = _RADIO_MODES.get(mode)
+        if radio_mode is None:
             logger.error(f"Invalid radio mode: {mode}")
             return
+        
+        self.mode = radio_mode
+        
+        self._invalidate_info()
             
-        # Restart radio process with new mode
-        if self.process:
-            try:
-                self.process.terminate()
-                self.process.wait(timeout=2.0)
-                self.process = None
-            except Exception as e:
-                logger.error(f"Error terminating radio process: {e}")
+        # Restart radio process with new mode, the receivers are mode specific
+        self._stop_process()
         
         # Scan for stations in the new mode
         self._scan_stations()
@@ -147,16 +241,8 @@ class RadioService:
             logger.error(f"Invalid FM frequency: {frequency}")
             return
             
-        self.frequency = frequency
-        
-        # Restart radio process with new frequency
-        if self.process:
-            try:
-                self.process.terminate()
-                self.process.wait(timeout=2.0)
-                self.process = None
-            except Exception as e:
-                logger.error(f"Error terminating radio process: {e}")
+        self._update_frequency(frequency)
+        self._tune_fm()
     
     def seek_next(self):
         """Seek to the next available station."""
@@ -167,13 +253,12 @@ class RadioService:
         self.current_station_index = (self.current_station_index + 1) % len(self.station_list)
         
         if self.mode == RadioMode.FM:
-            self.frequency = self.station_list[self.current_station_index]
-            self._start_fm_radio()
+            self._update_frequency(self.station_list[self.current_station_index])
+            self._tune_fm()
         else:
             # For DAB, station_list contains (station_id, station_name) tuples
             station_id, station_name = self.station_list[self.current_station_index]
-            self.current_station = station_name
-            self._start_dab_radio(station_id)
+            self._tune_dab(station_id)
     
     def seek_prev(self):
         """Seek to the previous available station."""
@@ -184,80 +269,112 @@ class RadioService:
         self.current_station_index = (self.current_station_index - 1) % len(self.station_list)
         
         if self.mode == RadioMode.FM:
-            self.frequency = self.station_list[self.current_station_index]
-            self._start_fm_radio()
+            self._update_frequency(self.station_list[self.current_station_index])
+            self._tune_fm()
         else:
             # For DAB, station_list contains (station_id, station_name) tuples
             station_id, station_name = self.station_list[self.current_station_index]
-            self.current_station = station_name
-            self._start_dab_radio(station_id)
+            self._tune_dab(station_id)
     
     def get_current_info(self):
         """
         Get the current radio information.
         
         Returns:
-            dict: Dictionary containing radio information
+            Mapping: Read-only view of the radio information
+        """
+        # Only rebuilt after the state changed, see _invalidate_info(); read
+        # the version first, so a change during the build makes the stored
+        # result outdated right away instead of caching stale data
+        version = self._info_version
+        cache = self._info_cache
+        if cache is None or cache[0] != version:
+            mode = self.mode
+            
+            if mode == RadioMode.FM:
+                frequency_str = self._frequency_str
+            else:
+                frequency_str = "DAB"
+                
+            cache = self._info_cache = (version, types.MappingProxyType({
+                'mode': mode.name,
+                'frequency': frequency_str,
+                'station_name': self.current_station,
+                'rds_text': self.rds_text,
+                'signal_strength': self.signal_strength
+            }))
+        
+        return cache[1]
+    
+    def _invalidate_info(self):
+        """Mark the cached get_current_info() result as outdated."""
+        self._info_version = next(self._info_versions)
+    
+    def _update_frequency(self, frequency):
         """
-        mode_str = 'FM' if self.mode == RadioMode.FM else 'DAB'
+        Update the FM frequency and its display string.
         
+        Args:
+            frequency (float): FM frequency in MHz
+        """
+        self.frequency = frequency
+        self._frequency_str = f"{frequency:.2f} MHz"
+        self._invalidate_info()
+    
+    def _start_reception(self):
+        """Start radio reception of the current station."""
         if self.mode == RadioMode.FM:
-            frequency_str = f"{self.frequency:.2f} MHz"
-        else:
-            frequency_str = "DAB"
+            self._start_fm_radio()
+        elif len(self.station_list) > 0:
+            station_id, station_name = self.station_list[self.current_station_index]
+            self._start_dab_radio(station_id)
+    
+    def _schedule_event(self, name, interval, handler):
+        """
+        Schedule a periodic event.
+        
+        Args:
+            name (str): Event name
+            interval (float): Seconds until the event fires
+            handler (callable): Function to call when the event fires
+        """
+        with self._events_lock:
+            if not self.running:
+                return
             
-        return {
-            'mode': mode_str,
-            'frequency': frequency_str,
-            'station_name': self.current_station,
-            'rds_text': self.rds_text,
-            'signal_strength': self.signal_strength
-        }
+            self._events[name] = default_scheduler.enter(
+                interval, self._run_event, name, interval, handler)
     
-    def _radio_thread(self):
-        """Thread function to manage radio processes."""
+    def _run_event(self, name, interval, handler):
+        """Run a periodic event and schedule its next occurrence."""
         try:
-            # Initial scan for stations
-            self._scan_stations()
-            
-            # Start radio reception
-            if self.mode == RadioMode.FM:
-                self._start_fm_radio()
-            else:
-                if len(self.station_list) > 0:
-                    station_id, station_name = self.station_list[0]
-                    self._start_dab_radio(station_id)
-            
-            # Monitor radio process and update info
-            while self.running:
-                if self.process and self.process.poll() is not None:
-                    # Process has exited
-                    logger.warning("Radio process has exited unexpectedly")
-                    self.process = None
-                    
-                    # Restart after a delay
-                    time.sleep(1.0)
-                    if self.mode == RadioMode.FM:
-                        self._start_fm_radio()
-                    else:
-                        if len(self.station_list) > 0:
-                            station_id, station_name = self.station_list[self.current_station_index]
-                            self._start_dab_radio(station_id)
-                
-                # Read process output for RDS updates
-                if self.process:
-                    self._update_radio_info()
-                
-                time.sleep(0.2)
-                
+            handler()
         except Exception as e:
-            logger.error(f"Error in radio thread: {e}")
-            self.active = False
+            logger.error(f"Error in radio {name} event: {e}")
+        
+        self._schedule_event(name, interval, handler)
+    
+    def _monitor_event(self):
+        """Monitor the radio process and update the signal strength."""
+        if self.process and self.process.poll() is not None:
+            # Process has exited, restart it
+            logger.warning("Radio process has exited unexpectedly")
+            self.process = None
+            self._start_reception()
+        
+        # Read process output for signal updates
+        if self.process:
+            self._update_signal_strength()
+    
+    def _rds_text_event(self):
+        """Update the RDS text."""
+        if self.process:
+            self._update_rds_text()
     
     def _scan_stations(self):
         """Scan for available radio stations."""
         try:
-            logger.info(f"Scanning for {'FM' if self.mode == RadioMode.FM else 'DAB'} stations")
+            logger.info(f"Scanning for {self.mode.name} stations")
             self.station_list = []
             
             if self.mode == RadioMode.FM:
@@ -286,13 +403,48 @@ class RadioService:
         except Exception as e:
             logger.error(f"Error scanning for stations: {e}")
     
+    def _stop_process(self):
+        """Stop the radio process, if one is running, without waiting for it."""
+        process, self.process = self.process, None
+        if process:
+            try:
+                process.terminate()
+            except Exception as e:
+                logger.error(f"Error terminating radio process: {e}")
+                return
+            
+            # Waiting here would hold up the shared scheduler thread, which
+            # also runs the other services, so poll for the exit instead
+            self._reap_process(process, PROCESS_STOP_TIMEOUT)
+    
+    def _reap_process(self, process, time_left):
+        """
+        Collect a terminated radio process once it has exited.
+        
+        Args:
+            process (subprocess.Popen): Terminated process
+            time_left (float): Seconds until the process gets killed
+        """
+        try:
+            if process.poll() is not None:
+                return
+            
+            if time_left <= 0:
+                logger.warning("Radio process didn't exit, killing it")
+                process.kill()
+                # Collect it on the next check; a killed process exits right away
+                time_left = float('inf')
+        except Exception as e:
+            logger.error(f"Error terminating radio process: {e}")
+            return
+        
+        default_scheduler.enter(PROCESS_REAP_INTERVAL, self._reap_process,
+                                process, time_left - PROCESS_REAP_INTERVAL)
+    
     def _start_fm_radio(self):
         """Start FM radio reception."""
         try:
-            if self.process:
-                self.process.terminate()
-                self.process.wait(timeout=2.0)
-                self.process = None
+            self._stop_process()
             
             # Use rtl_fm to receive FM radio
             # This is a simplified example - real implementation would use actual rtl_fm command
@@ -307,30 +459,21 @@ class RadioService:
             # ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             
             # For demonstration, we'll just update the station info based on frequency
-            # In real implementation, this would come from RDS data
-            station_names = {
-                87.9: "ROCK FM",
-                88.5: "CLASSIC HITS",
-                89.1: "NEWS 24/7",
-                91.3: "SMOOTH JAZZ",
-                93.5: "TOP 40",
-                95.7: "COUNTRY",
-                97.9: "TALK RADIO",
-                99.1: "HIP HOP",
-                101.3: "CLASSICAL",
-                103.5: "ALTERNATIVE",
-                105.7: "OLDIES",
-                107.9: "POP HITS"
-            }
-            
-            # Find closest frequency in our dictionary
-            closest_freq = min(station_names.keys(), key=lambda x: abs(x - self.frequency))
-            self.current_station = station_names.get(closest_freq, "Unknown Station")
-            self.rds_text = f"You're listening to {self.current_station}"
+            self._tune_fm()
             
         except Exception as e:
             logger.error(f"Error starting FM radio: {e}")
     
+    def _tune_fm(self):
+        """Tune the FM radio to the current frequency, keeping its process running."""
+        # In a real implementation, this would send the new frequency to the
+        # running receiver (e.g. rtl_tcp's set frequency command) rather than
+        # restarting it, which would interrupt the audio for seconds
+        closest_freq = _closest_fm_station_freq(self.frequency)
+        self.current_station = _FM_STATION_NAMES.get(closest_freq, "Unknown Station")
+        self.rds_text = f"You're listening to {self.current_station}"
+        self._invalidate_info()
+    
     def _start_dab_radio(self, station_id):
         """
         Start DAB radio reception for a specific station.
@@ -339,10 +482,7 @@ class RadioService:
             station_id (str): DAB station ID
         """
         try:
-            if self.process:
-                self.process.terminate()
-                self.process.wait(timeout=2.0)
-                self.process = None
+            self._stop_process()
             
             # Use rtl_dab to receive DAB radio
             # This is a simplified example - real implementation would use actual rtl_dab command
@@ -355,31 +495,37 @@ class RadioService:
             #     'aplay', '-r', '48000', '-f', 'S16_LE', '-t', 'raw', '-c', '2'
             # ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             
-            # For demonstration, find the station name from station_id
-            station_name = next((name for sid, name in self.station_list if sid == station_id), "Unknown Station")
-            self.current_station = station_name
-            self.rds_text = f"DAB: {station_name}"
+            self._tune_dab(station_id)
             
         except Exception as e:
             logger.error(f"Error starting DAB radio: {e}")
     
-    def _update_radio_info(self):
-        """Update radio information (RDS text, signal strength, etc.)."""
+    def _tune_dab(self, station_id):
+        """
+        Select a DAB station, keeping the radio process running.
+        
+        Args:
+            station_id (str): DAB station ID
+        """
+        # In a real implementation, this would select the service in the
+        # running receiver instead of restarting it
+        # For demonstration, find the station name from station_id
+        station_name = next((name for sid, name in self.station_list if sid == station_id), "Unknown Station")
+        self.current_station = station_name
+        self.rds_text = f"DAB: {station_name}"
+        self._invalidate_info()
+    
+    def _update_rds_text(self):
+        """Update the RDS text."""
         # In a real implementation, this would parse output from rtl_fm/rtl_dab
         # For demonstration, we'll simulate RDS text updates
-        
-        # Simulate changing RDS text occasionally
-        if self.mode == RadioMode.FM and time.time() % 10 < 0.2:  # Change every ~10 seconds
-            rds_texts = [
-                f"You're listening to {self.current_station}",
-                f"{self.current_station} - Your Music Station",
-                "Text us at 12345",
-                "Follow us on social media",
-                f"{self.current_station} - No commercials"
-            ]
-            import random
-            self.rds_text = random.choice(rds_texts)
-        
+        if self.mode == RadioMode.FM:
+            # Only the chosen text gets formatted
+            self.rds_text = random.choice(_RDS_TEXT_TEMPLATES).format(station=self.current_station)
+            self._invalidate_info()
+    
+    def _update_signal_strength(self):
+        """Update the signal strength."""
         # Simulate signal strength fluctuations
-        import random
         self.signal_strength = min(100, max(0, self.signal_strength + random.randint(-5, 5)))
+        self._invalidate_info()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""
+Scheduler Module
+Runs timed callbacks for the simulated services on a single worker thread
+"""
+
+import sched
+import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Scheduler:
+    """
+    Runs delayed callbacks on one shared worker thread, instead of each
+    service spawning its own threads and threading.Timer instances.
+    """
+    
+    def __init__(self):
+        """Initialize the scheduler."""
+        self._scheduler = sched.scheduler(time.monotonic, time.sleep)
+        self._condition = threading.Condition()
+        self._entered = False  # Set when an event is added while waiting
+        self._thread = None
+    
+    def enter(self, delay, action, *args):
+        """
+        Schedule a callback.
+        
+        Args:
+            delay (float): Seconds to wait before calling the action
+            action (callable): Function to call
+            *args: Arguments for the action
+        
+        Returns:
+            Event that can be passed to cancel()
+        """
+        with self._condition:
+            event = self._scheduler.enter(delay, 1, self._run_action, (action, args))
+            self._entered = True
+            self._condition.notify()
+            
+            if not self._thread:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        
+        return event
+    
+    def cancel(self, event):
+        """
+        Cancel a scheduled callback if it hasn't run yet.
+        
+        Args:
+            event: Event returned by enter()
+        """
+        try:
+            self._scheduler.cancel(event)
+        except ValueError:
+            pass  # Already run or cancelled
+    
+    def _run(self):
+        """Thread function running the due callbacks."""
+        while True:
+            # Run everything that is due and get the delay until the next event
+            delay = self._scheduler.run(blocking=False)
+            
+            with self._condition:
+                # Re-check right away if an event was added in the meantime
+                if not self._entered:
+                    self._condition.wait(delay)
+                self._entered = False
+    
+    @staticmethod
+    def _run_action(action, args):
+        """Run a callback, keeping the worker alive if it fails."""
+        try:
+            action(*args)
+        except Exception as e:
+            logger.error(f"Error in scheduled task {action}: {e}")
+
+# Scheduler shared by the simulated services
+default_scheduler = Scheduler()
@@ -26,18 +26,31 @@ socket.on('connect', () => {
     console.log('Connected to server');
 });
 
-socket.on('vehicle_update', (data) => {
+function updateVehicleData(data) {
     // Update vehicle data
     if (mpgElement) mpgElement.textContent = `${data.avg_mpg} mpg`;
     if (avgSpeedElement) avgSpeedElement.textContent = `${data.avg_speed} mph`;
     if (weatherTempElement) weatherTempElement.textContent = `${data.outside_temp}°C`;
     if (timeElement && data.time) timeElement.textContent = data.time;
-});
+}
 
-socket.on('radio_update', (data) => {
+function updateRadioData(data) {
     // Update radio data
     if (trackElement) trackElement.textContent = data.station_name;
     if (sourceElement) sourceElement.textContent = `Bluetooth Audio`;
+}
+
+// Latest full data; ticks only carry changed keys, which are merged in here
+const vehicleState = {};
+const radioState = {};
+
+socket.on('vehicle_update', (data) => updateVehicleData(Object.assign(vehicleState, data)));
+socket.on('radio_update', (data) => updateRadioData(Object.assign(radioState, data)));
+
+// Periodic updates arrive batched in one event, with only the changed keys
+socket.on('tick', (data) => {
+    if (data.vehicle) updateVehicleData(Object.assign(vehicleState, data.vehicle));
+    if (data.radio) updateRadioData(Object.assign(radioState, data.radio));
 });
 
 // Clock update function (as fallback)
@@ -70,7 +70,7 @@ socket.on('connect', () => {
     console.log('Connected to server');
 });
 
-socket.on('vehicle_update', (data) => {
+function updateVehicleData(data) {
     // Update dashboard display
     speedGauge.textContent = Math.round(data.speed);
     rpmGauge.textContent = Math.round(data.rpm);
@@ -79,9 +79,9 @@ socket.on('vehicle_update', (data) => {
     coolantTemp.textContent = `${Math.round(data.coolant_temp)}°C`;
     timeDisplay.textContent = data.time;
     outsideTemp.textContent = `Outside: ${data.outside_temp}°C`;
-});
+}
 
-socket.on('radio_update', (data) => {
+function updateRadioData(data) {
     // Update media player display
     stationName.textContent = data.station_name;
     stationFrequency.textContent = data.frequency;
@@ -91,6 +91,19 @@ socket.on('radio_update', (data) => {
     signalValue.textContent = `${data.signal_strength}%`;
     playPauseButton.textContent = data.is_playing ? 'Pause' : 'Play';
     toggleModeButton.textContent = `Switch to ${data.mode === 'FM' ? 'DAB' : 'FM'}`;
+}
+
+// Latest full data; ticks only carry changed keys, which are merged in here
+const vehicleState = {};
+const radioState = {};
+
+socket.on('vehicle_update', (data) => updateVehicleData(Object.assign(vehicleState, data)));
+socket.on('radio_update', (data) => updateRadioData(Object.assign(radioState, data)));
+
+// Periodic updates arrive batched in one event, with only the changed keys
+socket.on('tick', (data) => {
+    if (data.vehicle) updateVehicleData(Object.assign(vehicleState, data.vehicle));
+    if (data.radio) updateRadioData(Object.assign(radioState, data.radio));
 });
 
 socket.on('audio_update', (data) => {
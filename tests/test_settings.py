@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the settings screen status labels
+"""
+
+import os
+import unittest
+
+# Run Kivy without a window or command line parsing
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+
+from kivy.clock import Clock
+
+from services.can_interface import CANInterface
+from services.radio import RadioService
+from ui.settings import SettingsScreen
+
+class SettingsStatusTest(unittest.TestCase):
+    """The status labels follow the status changes reported by the services."""
+
+    def setUp(self):
+        self.can_interface = CANInterface()
+        self.radio_service = RadioService()
+        self.screen = SettingsScreen(name='settings')
+        self.screen.attach_services(self.can_interface, self.radio_service)
+        Clock.tick()  # Run the @mainthread setters
+
+    def test_initial_status(self):
+        self.assertEqual(self.screen.can_status, 'Disconnected')
+        self.assertEqual(self.screen.radio_status, 'Inactive')
+
+    def test_can_status_change(self):
+        self.can_interface._set_connected(True)
+        Clock.tick()
+        self.assertEqual(self.screen.can_status, 'Connected')
+
+        self.can_interface._set_connected(False)
+        Clock.tick()
+        self.assertEqual(self.screen.can_status, 'Disconnected')
+
+    def test_radio_status_change(self):
+        self.radio_service._set_active(True)
+        Clock.tick()
+        self.assertEqual(self.screen.radio_status, 'Active')
+
+        self.radio_service._set_active(False)
+        Clock.tick()
+        self.assertEqual(self.screen.radio_status, 'Inactive')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,9 +10,13 @@ from kivy.clock import Clock
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Vehicle data fields shown on the dashboard, each one has a matching property
+VEHICLE_DATA_FIELDS = ('speed', 'rpm', 'fuel_level', 'coolant_temp', 'outside_temp')
+
 class DigitalGauge(BoxLayout):
     """A digital gauge widget for displaying numeric values with a label."""
     value = NumericProperty(0)
@@ -41,37 +45,44 @@ class DashboardScreen(Screen):
     
     def __init__(self, **kwargs):
         super(DashboardScreen, self).__init__(**kwargs)
+        self._pending_data = None  # Vehicle data waiting for _apply_vehicle_data()
+        self._apply_trigger = Clock.create_trigger(self._apply_vehicle_data)
+        self._last_minute = -1  # Minute of the day currently shown in `time`
         Clock.schedule_interval(self._update_time, 1)  # Update clock every second
     
     def _update_time(self, dt):
         """Update the displayed time."""
-        from datetime import datetime
-        self.time = datetime.now().strftime('%H:%M')
+        # Only format (and redraw) the time when the minute changed
+        now = time.localtime()
+        minute = now.tm_hour * 60 + now.tm_min
+        if minute != self._last_minute:
+            self._last_minute = minute
+            self.time = time.strftime('%H:%M', now)
     
     def update_vehicle_data(self, data):
         """
         Update the dashboard with new vehicle data.
         
         Args:
-            data (dict): Dictionary containing vehicle data from CAN bus.
-                Expected keys: speed, rpm, fuel_level, coolant_temp, outside_temp
+            data (VehicleData): Vehicle data snapshot from the CAN bus.
+                Expected fields: speed, rpm, fuel_level, coolant_temp, outside_temp
         """
+        # Apply only the latest snapshot on the next frame, so several
+        # updates within one frame only cause one round of redraws
+        self._pending_data = data
+        self._apply_trigger()
+    
+    def _apply_vehicle_data(self, dt):
+        """Apply the pending vehicle data to the properties."""
+        data, self._pending_data = self._pending_data, None
+        if data is None:
+            return
+        
         try:
-            # Update the properties with new data
-            if 'speed' in data:
-                self.speed = data['speed']
-            
-            if 'rpm' in data:
-                self.rpm = data['rpm']
-            
-            if 'fuel_level' in data:
-                self.fuel_level = data['fuel_level']
-            
-            if 'coolant_temp' in data:
-                self.coolant_temp = data['coolant_temp']
-            
-            if 'outside_temp' in data:
-                self.outside_temp = data['outside_temp']
+            # Update the properties with new data; Kivy properties only
+            # dispatch when the value actually changed
+            for field in VEHICLE_DATA_FIELDS:
+                setattr(self, field, getattr(data, field))
                 
             # Additional CAN data can be handled here
                 
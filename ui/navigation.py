@@ -6,7 +6,7 @@ Navigation Screen - Placeholder for navigation functionality
 
 from kivy.uix.screenmanager import Screen
 from kivy.properties import StringProperty
-from kivy.clock import Clock
+from kivy.clock import Clock, mainthread
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,10 +27,12 @@ class NavigationScreen(Screen):
         """Initialize UI components."""
         self.status_message = 'Navigation Ready'
     
+    @mainthread
     def update_vehicle_position(self, lat, lon, heading):
         """
         Update the vehicle position on the map.
         This is a placeholder for actual GPS/map integration.
+        Runs on the main thread, so a GPS thread can call it directly.
         
         Args:
             lat (float): Latitude
@@ -2,16 +2,33 @@
 
 """
 Settings Screen - System settings and configuration
+
+Kivy properties must only be set on the main thread. The services report
+status changes from their own threads, so those callbacks go through the
+@mainthread setters below instead of assigning properties directly.
 """
 
 from kivy.uix.screenmanager import Screen
 from kivy.properties import NumericProperty, StringProperty, BooleanProperty
-from kivy.clock import Clock
+from kivy.clock import Clock, mainthread
 import logging
 import os
+import threading
+
+from services.scheduler import default_scheduler
 
 logger = logging.getLogger(__name__)
 
+# Raspberry Pi display backlight control
+BACKLIGHT_PATH = '/sys/class/backlight/rpi_backlight/brightness'
+
+# Opened once, so brightness changes don't check for and reopen the file;
+# None if brightness control isn't available (e.g. not on a Raspberry Pi)
+try:
+    _backlight_fd = os.open(BACKLIGHT_PATH, os.O_WRONLY)
+except OSError:
+    _backlight_fd = None
+
 class SettingsScreen(Screen):
     """
     Settings screen for system configuration.
@@ -25,8 +42,23 @@ class SettingsScreen(Screen):
     
     def __init__(self, **kwargs):
         super(SettingsScreen, self).__init__(**kwargs)
+        self._pending_backlight = None  # Value waiting for _write_backlight()
+        self._backlight_lock = threading.Lock()
+        self._app = None  # Set by _get_app() once the screen is in the manager
+        self._can_interface = None  # Services reporting status, see attach_services()
+        self._radio_service = None
         Clock.schedule_once(self._init_settings, 1)
-        Clock.schedule_interval(self._update_status, 5)  # Update status every 5 seconds
+    
+    def _get_app(self):
+        """
+        Get the app, looked up through the screen manager on first use.
+        
+        Returns:
+            The app, or None if the screen isn't in a manager yet
+        """
+        if self._app is None and self.manager:
+            self._app = self.manager.parent.app
+        return self._app
     
     def _init_settings(self, dt):
         """Initialize settings from storage or defaults."""
@@ -35,28 +67,53 @@ class SettingsScreen(Screen):
         self.brightness = 80
         self.audio_balance = 50
         self.system_version = '1.0.0'
+    
+    def attach_services(self, can_interface, radio_service):
+        """
+        Show the status of the services and follow their status changes.
+        Called by the app once it created the services.
         
-        # Get app reference for service status
-        app = self.manager.parent.app if self.manager else None
-        if app:
-            # Update status based on services
-            if app.can_interface:
-                self.can_status = 'Connected' if app.can_interface.is_connected() else 'Disconnected'
-            
-            if app.radio_service:
-                self.radio_status = 'Active' if app.radio_service.is_active() else 'Inactive'
+        Args:
+            can_interface (CANInterface): CAN bus interface, or None
+            radio_service (RadioService): Radio service, or None
+        """
+        self._can_interface = can_interface
+        self._radio_service = radio_service
+        
+        # The services report status changes, so there is no need to poll them
+        if can_interface:
+            can_interface.add_status_listener(self._on_status_change)
+        
+        if radio_service:
+            radio_service.add_status_listener(self._on_status_change)
+        
+        self._update_status(None)
+    
+    def _on_status_change(self):
+        """Called by the services (from their threads) when their status changed."""
+        self._update_status(None)
+    
+    @mainthread
+    def _set_can_status(self, status):
+        """Set the CAN status on the main thread."""
+        self.can_status = status
+    
+    @mainthread
+    def _set_radio_status(self, status):
+        """Set the radio status on the main thread."""
+        self.radio_status = status
     
     def _update_status(self, dt):
-        """Update status information periodically."""
-        # Get app reference for service status
-        app = self.manager.parent.app if self.manager else None
-        if app:
-            # Update status based on services
-            if app.can_interface:
-                self.can_status = 'Connected' if app.can_interface.is_connected() else 'Disconnected'
-            
-            if app.radio_service:
-                self.radio_status = 'Active' if app.radio_service.is_active() else 'Inactive'
+        """Update status information."""
+        # Update status based on services; the services keep their state
+        # flags current, and the properties only dispatch when the text changes
+        can_interface = self._can_interface
+        if can_interface:
+            self._set_can_status('Connected' if can_interface.connected else 'Disconnected')
+        
+        radio_service = self._radio_service
+        if radio_service:
+            self._set_radio_status('Active' if radio_service.active else 'Inactive')
     
     def adjust_brightness(self, value):
         """
@@ -68,14 +125,27 @@ class SettingsScreen(Screen):
         self.brightness = max(0, min(100, value))
         
         # On Raspberry Pi, we could set the actual screen brightness
-        # This is a simplified version for development
+        # Convert 0-100 scale to 0-255 for Raspberry Pi
+        rpi_brightness = int(self.brightness * 2.55)
+        if _backlight_fd is None:
+            return
+        
+        # Write from the scheduler thread so the UI never waits on sysfs; while
+        # a write is pending, slider moves only replace the value to write
+        with self._backlight_lock:
+            scheduled = self._pending_backlight is not None
+            self._pending_backlight = rpi_brightness
+        
+        if not scheduled:
+            default_scheduler.enter(0, self._write_backlight)
+    
+    def _write_backlight(self):
+        """Write the pending brightness to the display backlight."""
+        with self._backlight_lock:
+            rpi_brightness, self._pending_backlight = self._pending_backlight, None
+        
         try:
-            # Check if running on Raspberry Pi and brightness control is available
-            if os.path.exists('/sys/class/backlight/rpi_backlight/brightness'):
-                # Convert 0-100 scale to 0-255 for Raspberry Pi
-                rpi_brightness = int(self.brightness * 2.55)
-                with open('/sys/class/backlight/rpi_backlight/brightness', 'w') as f:
-                    f.write(str(rpi_brightness))
+            os.pwrite(_backlight_fd, str(rpi_brightness).encode(), 0)
         except Exception as e:
             logger.error(f"Error adjusting brightness: {e}")
     
@@ -89,7 +159,7 @@ class SettingsScreen(Screen):
         self.audio_balance = max(0, min(100, value))
         
         # Get app reference to adjust audio
-        app = self.manager.parent.app if self.manager else None
+        app = self._get_app()
         if app and app.audio_manager:
             try:
                 # Convert 0-100 to -1.0 to 1.0 range for audio balance
@@ -104,7 +174,7 @@ class SettingsScreen(Screen):
         self.night_mode = not self.night_mode
         
         # Apply night mode changes to the app theme
-        app = self.manager.parent.app if self.manager else None
+        app = self._get_app()
         if app:
             # This would apply different theme settings based on night mode
             # For now, we'll just log the change
@@ -112,7 +182,7 @@ class SettingsScreen(Screen):
     
     def restart_services(self):
         """Restart all services."""
-        app = self.manager.parent.app if self.manager else None
+        app = self._get_app()
         if app:
             try:
                 # Restart CAN interface
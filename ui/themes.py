@@ -4,8 +4,14 @@
 Theme definitions for the BMW iD6-style UI
 """
 
+from types import MappingProxyType
+
 from kivy.utils import get_color_from_hex
 
+def _color(hex_color):
+    """Convert a hex color to an immutable (r, g, b, a) tuple shared by its users."""
+    return tuple(get_color_from_hex(hex_color))
+
 # Define the BMW iD6 color scheme
 class BMWID6Theme:
     """
@@ -14,25 +20,33 @@ class BMWID6Theme:
     """
     
     # Main colors
-    PRIMARY = get_color_from_hex('#1c69d4')  # BMW blue
-    SECONDARY = get_color_from_hex('#666666')
-    BACKGROUND = get_color_from_hex('#000000')
-    PANEL_BACKGROUND = get_color_from_hex('#1a1a1a')
-    TEXT_PRIMARY = get_color_from_hex('#ffffff')
-    TEXT_SECONDARY = get_color_from_hex('#cccccc')
-    TEXT_DISABLED = get_color_from_hex('#555555')
+    PRIMARY = _color('#1c69d4')  # BMW blue
+    SECONDARY = _color('#666666')
+    BACKGROUND = _color('#000000')
+    PANEL_BACKGROUND = _color('#1a1a1a')
+    TEXT_PRIMARY = _color('#ffffff')
+    TEXT_SECONDARY = _color('#cccccc')
+    TEXT_DISABLED = _color('#555555')
     
     # Accent colors
-    ACCENT_RED = get_color_from_hex('#ff0000')
-    ACCENT_GREEN = get_color_from_hex('#00ff00')
-    ACCENT_YELLOW = get_color_from_hex('#ffcc00')
+    ACCENT_RED = _color('#ff0000')
+    ACCENT_GREEN = _color('#00ff00')
+    ACCENT_YELLOW = _color('#ffcc00')
     
     # Night mode colors (slightly dimmer)
-    NIGHT_PRIMARY = get_color_from_hex('#0a3b77')
-    NIGHT_BACKGROUND = get_color_from_hex('#000000')
-    NIGHT_PANEL_BACKGROUND = get_color_from_hex('#0a0a0a')
-    NIGHT_TEXT_PRIMARY = get_color_from_hex('#bbbbbb')
-    NIGHT_TEXT_SECONDARY = get_color_from_hex('#888888')
+    NIGHT_PRIMARY = _color('#0a3b77')
+    NIGHT_BACKGROUND = _color('#000000')
+    NIGHT_PANEL_BACKGROUND = _color('#0a0a0a')
+    NIGHT_TEXT_PRIMARY = _color('#bbbbbb')
+    NIGHT_TEXT_SECONDARY = _color('#888888')
+    
+    # Widget colors
+    CONTROL_BACKGROUND = (0.2, 0.2, 0.2, 1)
+    CONTROL_BACKGROUND_DOWN = (0.4, 0.4, 0.4, 1)
+    CONTROL_BACKGROUND_OFF = (0.3, 0.3, 0.3, 1)
+    GAUGE_ARC = (0.8, 0.8, 0.8, 1)
+    SLIDER_PROGRESS = (0.4, 0.6, 0.8, 1)
+    TRANSPARENT = (0, 0, 0, 0)
     
     # Font sizes
     FONT_SIZE_SMALL = 14
@@ -59,21 +73,23 @@ class BMWID6Theme:
             night_mode (bool): Whether to use night mode colors
             
         Returns:
-            dict: Dictionary of theme colors
+            Mapping: Read-only mapping of theme colors
         """
-        if night_mode:
-            return {
-                'primary': BMWID6Theme.NIGHT_PRIMARY,
-                'background': BMWID6Theme.NIGHT_BACKGROUND,
-                'panel_background': BMWID6Theme.NIGHT_PANEL_BACKGROUND,
-                'text_primary': BMWID6Theme.NIGHT_TEXT_PRIMARY,
-                'text_secondary': BMWID6Theme.NIGHT_TEXT_SECONDARY,
-            }
-        else:
-            return {
-                'primary': BMWID6Theme.PRIMARY,
-                'background': BMWID6Theme.BACKGROUND,
-                'panel_background': BMWID6Theme.PANEL_BACKGROUND,
-                'text_primary': BMWID6Theme.TEXT_PRIMARY,
-                'text_secondary': BMWID6Theme.TEXT_SECONDARY,
-            }
+        return _NIGHT_THEME if night_mode else _DAY_THEME
+
+# Theme colors, built once; read-only since all callers share them
+_DAY_THEME = MappingProxyType({
+    'primary': BMWID6Theme.PRIMARY,
+    'background': BMWID6Theme.BACKGROUND,
+    'panel_background': BMWID6Theme.PANEL_BACKGROUND,
+    'text_primary': BMWID6Theme.TEXT_PRIMARY,
+    'text_secondary': BMWID6Theme.TEXT_SECONDARY,
+})
+
+_NIGHT_THEME = MappingProxyType({
+    'primary': BMWID6Theme.NIGHT_PRIMARY,
+    'background': BMWID6Theme.NIGHT_BACKGROUND,
+    'panel_background': BMWID6Theme.NIGHT_PANEL_BACKGROUND,
+    'text_primary': BMWID6Theme.NIGHT_TEXT_PRIMARY,
+    'text_secondary': BMWID6Theme.NIGHT_TEXT_SECONDARY,
+})
@@ -10,26 +10,33 @@ from kivy.uix.label import Label
 from kivy.uix.progressbar import ProgressBar
 from kivy.properties import NumericProperty, StringProperty, BooleanProperty, ListProperty
 from kivy.graphics import Color, Rectangle, Line, Ellipse
+from kivy.metrics import dp
 from kivy.uix.slider import Slider
 import math
 
+from ui.themes import BMWID6Theme
+
 class BMWID6Button(Button):
     """
     Custom button styled after BMW iD6 interface buttons.
     """
-    background_color_normal = ListProperty([0.2, 0.2, 0.2, 1])
-    background_color_down = ListProperty([0.4, 0.4, 0.4, 1])
+    background_color_normal = ListProperty(BMWID6Theme.CONTROL_BACKGROUND)
+    background_color_down = ListProperty(BMWID6Theme.CONTROL_BACKGROUND_DOWN)
     border_radius = NumericProperty(10)
     
     def __init__(self, **kwargs):
         super(BMWID6Button, self).__init__(**kwargs)
-        self.background_color = [0, 0, 0, 0]  # Make the standard background transparent
+        self.background_color = BMWID6Theme.TRANSPARENT  # Make the standard background transparent
         
-    def on_size(self, *args):
-        self.canvas.before.clear()
+        # Create the background once, updates only change its attributes
         with self.canvas.before:
-            Color(*self.background_color_normal if not self.state == 'down' else self.background_color_down)
-            Rectangle(pos=self.pos, size=self.size, radius=[self.border_radius])
+            self._bg_color = Color(*self.background_color_normal)
+            self._bg_rect = Rectangle(pos=self.pos, size=self.size, radius=[self.border_radius])
+        
+    def on_size(self, *args):
+        self._bg_color.rgba = self.background_color_normal if not self.state == 'down' else self.background_color_down
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
 
 class BMWID6Gauge(BoxLayout):
     """
@@ -41,54 +48,82 @@ class BMWID6Gauge(BoxLayout):
     max_value = NumericProperty(100)
     title = StringProperty('')
     unit = StringProperty('')
-    gauge_color = ListProperty([0.8, 0.8, 0.8, 1])
+    gauge_color = ListProperty(BMWID6Theme.GAUGE_ARC)
+    
+    # Drawing dimensions, converted once
+    BACKGROUND_MARGIN = dp(10)
+    ARC_INSET = dp(15)
+    ARC_WIDTH = dp(5)
     
     def __init__(self, **kwargs):
         super(BMWID6Gauge, self).__init__(**kwargs)
-        self.bind(value=self.update_gauge,
-                 size=self.update_gauge,
-                 pos=self.update_gauge)
-    
-    def update_gauge(self, *args):
-        self.canvas.before.clear()
+        self._drawn = None  # (angle, pos, size) of the current drawing
+        
+        # Create the drawing once, updates only change its attributes
         with self.canvas.before:
-            # Draw background circle
-            Color(0.2, 0.2, 0.2, 1)
-            Ellipse(pos=(self.pos[0] + dp(10), self.pos[1] + dp(10)), 
-                   size=(self.width - dp(20), self.height - dp(20)))
+            # Background circle
+            Color(*BMWID6Theme.CONTROL_BACKGROUND)
+            self._background = Ellipse()
             
-            # Draw gauge arc
-            Color(*self.gauge_color)
-            percentage = (self.value - self.min_value) / (self.max_value - self.min_value)
-            angle = 240 * percentage  # Gauge spans 240 degrees
-            Line(circle=(self.center_x, self.center_y, min(self.width, self.height) / 2 - dp(15), 
-                        150, 150 + angle), width=dp(5))
+            # Gauge arc
+            self._arc_color = Color(*self.gauge_color)
+            self._arc = Line(width=self.ARC_WIDTH)
+        
+        self.fbind('value', self.update_gauge)
+        self.fbind('size', self.update_gauge)
+        self.fbind('pos', self.update_gauge)
+    
+    def update_gauge(self, *args):
+        percentage = (self.value - self.min_value) / (self.max_value - self.min_value)
+        angle = int(240 * percentage)  # Gauge spans 240 degrees, drawn in whole degrees
+        
+        # Only redraw when the arc moved by a degree or the widget moved
+        drawn = (angle, tuple(self.pos), tuple(self.size))
+        if drawn == self._drawn:
+            return
+        self._drawn = drawn
+        
+        # Update background circle
+        margin = self.BACKGROUND_MARGIN
+        self._background.pos = (self.pos[0] + margin, self.pos[1] + margin)
+        self._background.size = (self.width - 2 * margin, self.height - 2 * margin)
+        
+        # Update gauge arc
+        self._arc_color.rgba = self.gauge_color
+        self._arc.circle = (self.center_x, self.center_y, min(self.width, self.height) / 2 - self.ARC_INSET,
+                            150, 150 + angle)
 
 class BMWID6Slider(Slider):
     """
     Custom slider styled after BMW iD6 interface.
     """
-    track_color = ListProperty([0.2, 0.2, 0.2, 1])
-    progress_color = ListProperty([0.4, 0.6, 0.8, 1])
+    track_color = ListProperty(BMWID6Theme.CONTROL_BACKGROUND)
+    progress_color = ListProperty(BMWID6Theme.SLIDER_PROGRESS)
     
     def __init__(self, **kwargs):
         super(BMWID6Slider, self).__init__(**kwargs)
         self.cursor_size = (dp(20), dp(20))
         
-    def on_size(self, *args):
-        self.canvas.before.clear()
+        # Create the track once, updates only change its attributes
         with self.canvas.before:
-            # Draw track
-            Color(*self.track_color)
-            Rectangle(pos=(self.x, self.center_y - dp(2)), 
-                     size=(self.width, dp(4)))
-            
-            # Draw progress
-            Color(*self.progress_color)
-            # Calculate progress width
-            progress_width = self.width * (self.value - self.min) / (self.max - self.min)
-            Rectangle(pos=(self.x, self.center_y - dp(2)), 
-                     size=(progress_width, dp(4)))
+            self._track_color = Color(*self.track_color)
+            self._track = Rectangle()
+            self._progress_color = Color(*self.progress_color)
+            self._progress = Rectangle()
+        
+    def on_size(self, *args):
+        # Update track
+        pos = (self.x, self.center_y - dp(2))
+        self._track_color.rgba = self.track_color
+        self._track.pos = pos
+        self._track.size = (self.width, dp(4))
+        
+        # Update progress
+        self._progress_color.rgba = self.progress_color
+        # Calculate progress width
+        progress_width = self.width * (self.value - self.min) / (self.max - self.min)
+        self._progress.pos = pos
+        self._progress.size = (progress_width, dp(4))
 
 class StatusBar(BoxLayout):
     """
@@ -108,7 +143,7 @@ class StatusBar(BoxLayout):
         self.add_widget(self.time_label)
         
         # Bind properties
-        self.bind(time=self._update_time)
+        self.fbind('time', self._update_time)
     
     def _update_time(self, instance, value):
         self.time_label.text = value
@@ -143,9 +178,10 @@ class MainMenuBar(BoxLayout):
         self.add_widget(self.media_btn)
         self.add_widget(self.nav_btn)
         self.add_widget(self.settings_btn)
+        self._nav_buttons = (self.dashboard_btn, self.media_btn, self.nav_btn, self.settings_btn)
         
         # Bind properties
-        self.bind(active_screen=self._update_buttons)
+        self.fbind('active_screen', self._update_buttons)
     
     def switch_screen(self, button):
         """Switch to the selected screen."""
@@ -156,9 +192,8 @@ class MainMenuBar(BoxLayout):
     
     def _update_buttons(self, instance, value):
         """Update button states based on active screen."""
-        for child in self.children:
-            if hasattr(child, 'screen'):
-                child.state = 'down' if child.screen == value else 'normal'
+        for button in self._nav_buttons:
+            button.state = 'down' if button.screen == value else 'normal'
 
 class VehicleDataWidget(BoxLayout):
     """
@@ -183,9 +218,9 @@ class VehicleDataWidget(BoxLayout):
         self.add_widget(self.unit_widget)
         
         # Bind properties
-        self.bind(label=self._update_label,
-                 value=self._update_value,
-                 unit=self._update_unit)
+        self.fbind('label', self._update_label)
+        self.fbind('value', self._update_value)
+        self.fbind('unit', self._update_unit)
     
     def _update_label(self, instance, value):
         self.label_widget.text = value
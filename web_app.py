@@ -6,16 +6,30 @@ Web-based BMW iD6 UI
 Uses Flask and SocketIO to create a web interface mimicking the BMW iD6 system
 """
 
+# Use eventlet for Socket.IO when available; it must patch the stdlib
+# before anything else is imported
+try:
+    import eventlet
+    eventlet.monkey_patch()
+except ImportError:
+    eventlet = None
+
 import os
+import bisect
 import logging
-import json
-import threading
 import time
+import threading
 import random
 from datetime import datetime
 from flask import Flask, render_template, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the stdlib json encoder
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,9 +37,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes responses with orjson."""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+class OrjsonSerializer:
+    """json module replacement that lets Socket.IO encode with orjson."""
+    
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'bmw-id6-secret!'
-socketio = SocketIO(app)
+async_mode = 'eventlet' if eventlet else 'threading'
+if orjson:
+    # jsonify() and every emit encode through orjson
+    app.json = OrjsonProvider(app)
+    socketio = SocketIO(app, async_mode=async_mode, json=OrjsonSerializer)
+else:
+    socketio = SocketIO(app, async_mode=async_mode)
+
+# Cached 'HH:MM' string, refreshed when the minute rolls over
+_time_cache = {'epoch_minute': -1, 'hm': ''}
+
+def current_time_hm():
+    """
+    Get the current time formatted as 'HH:MM'.
+    
+    Returns:
+        str: Current time, formatted at most once per minute
+    """
+    epoch_minute = int(time.time()) // 60
+    if _time_cache['epoch_minute'] != epoch_minute:
+        _time_cache['epoch_minute'] = epoch_minute
+        _time_cache['hm'] = datetime.now().strftime('%H:%M')
+    return _time_cache['hm']
 
 # Shared data for vehicle status
 vehicle_data = {
@@ -35,7 +94,7 @@ vehicle_data = {
     'coolant_temp': 90,
     'outside_temp': 22,
     'engine_on': True,
-    'time': datetime.now().strftime('%H:%M')
+    'time': current_time_hm()
 }
 
 # Radio data
@@ -74,6 +133,10 @@ dab_stations = [
     ("0x1007", "Capital")
 ]
 
+# Station lookups for seeking, built once
+fm_frequencies = sorted(fm_stations)
+dab_station_indices = {station_name: i for i, (_, station_name) in enumerate(dab_stations)}
+
 # Audio settings
 audio_settings = {
     'volume': 50,  # 0-100
@@ -124,7 +187,7 @@ def settings():
 def get_vehicle_data():
     """API endpoint to get current vehicle data."""
     # Update the time
-    vehicle_data['time'] = datetime.now().strftime('%H:%M')
+    vehicle_data['time'] = current_time_hm()
     return jsonify(vehicle_data)
 
 @app.route('/api/radio-data')
@@ -136,6 +199,8 @@ def get_radio_data():
 def handle_connect():
     """Handle client connection."""
     logger.info('Client connected')
+    # Also covers servers that import the app instead of running __main__
+    start_simulation()
     socketio.emit('vehicle_update', vehicle_data)
     socketio.emit('radio_update', radio_data)
 
@@ -172,85 +237,62 @@ def handle_radio_mode():
     logger.info(f"Radio mode changed to {radio_data['mode']}")
     socketio.emit('radio_update', radio_data)
 
-@socketio.on('seek_next_station')
-def handle_next_station():
-    """Seek to the next available station."""
+def find_fm_station_index(frequency):
+    """
+    Find the FM station at a frequency.
+    
+    Args:
+        frequency (float): Frequency in MHz
+        
+    Returns:
+        int: Index in fm_frequencies, or -1 if no station is within 0.2 MHz
+    """
+    # First station above frequency - 0.2, the stations are further apart than that
+    i = bisect.bisect_right(fm_frequencies, frequency - 0.2)
+    if i < len(fm_frequencies) and fm_frequencies[i] - frequency < 0.2:
+        return i
+    return -1
+
+def seek_station(step):
+    """
+    Tune to a neighbouring station.
+    
+    Args:
+        step (int): 1 for the next station, -1 for the previous one
+    """
     if radio_data['mode'] == 'FM':
         # Get the current frequency
         current_freq = float(radio_data['frequency'].split(' ')[0])
-        # Find the next frequency in the list
-        frequencies = sorted(fm_stations.keys())
-        current_index = -1
-        for i, freq in enumerate(frequencies):
-            if abs(freq - current_freq) < 0.2:  # Close enough to consider it the current station
-                current_index = i
-                break
+        current_index = find_fm_station_index(current_freq)
         
-        # Move to the next station
+        # Move to the neighbouring station
         if current_index != -1:
-            next_index = (current_index + 1) % len(frequencies)
-            next_freq = frequencies[next_index]
-            radio_data['frequency'] = f"{next_freq:.1f} MHz"
-            radio_data['station_name'] = fm_stations[next_freq]
+            freq = fm_frequencies[(current_index + step) % len(fm_frequencies)]
+            radio_data['frequency'] = f"{freq:.1f} MHz"
+            radio_data['station_name'] = fm_stations[freq]
             radio_data['rds_text'] = f"You're listening to {radio_data['station_name']}"
     else:
-        # For DAB, find the next station in the list
-        current_station = radio_data['station_name']
-        current_index = -1
-        for i, (_, station_name) in enumerate(dab_stations):
-            if station_name == current_station:
-                current_index = i
-                break
+        # For DAB, look up the current station in the list
+        current_index = dab_station_indices.get(radio_data['station_name'], -1)
         
-        # Move to the next station
+        # Move to the neighbouring station
         if current_index != -1:
-            next_index = (current_index + 1) % len(dab_stations)
-            _, next_station = dab_stations[next_index]
-            radio_data['station_name'] = next_station
-            radio_data['rds_text'] = f"DAB: {next_station}"
+            _, station = dab_stations[(current_index + step) % len(dab_stations)]
+            radio_data['station_name'] = station
+            radio_data['rds_text'] = f"DAB: {station}"
     
     logger.info(f"Tuned to {radio_data['station_name']}")
     socketio.emit('radio_update', radio_data)
 
+@socketio.on('seek_next_station')
+def handle_next_station():
+    """Seek to the next available station."""
+    seek_station(1)
+
 @socketio.on('seek_prev_station')
 def handle_prev_station():
     """Seek to the previous available station."""
-    if radio_data['mode'] == 'FM':
-        # Get the current frequency
-        current_freq = float(radio_data['frequency'].split(' ')[0])
-        # Find the previous frequency in the list
-        frequencies = sorted(fm_stations.keys())
-        current_index = -1
-        for i, freq in enumerate(frequencies):
-            if abs(freq - current_freq) < 0.2:  # Close enough to consider it the current station
-                current_index = i
-                break
-        
-        # Move to the previous station
-        if current_index != -1:
-            prev_index = (current_index - 1) % len(frequencies)
-            prev_freq = frequencies[prev_index]
-            radio_data['frequency'] = f"{prev_freq:.1f} MHz"
-            radio_data['station_name'] = fm_stations[prev_freq]
-            radio_data['rds_text'] = f"You're listening to {radio_data['station_name']}"
-    else:
-        # For DAB, find the previous station in the list
-        current_station = radio_data['station_name']
-        current_index = -1
-        for i, (_, station_name) in enumerate(dab_stations):
-            if station_name == current_station:
-                current_index = i
-                break
-        
-        # Move to the previous station
-        if current_index != -1:
-            prev_index = (current_index - 1) % len(dab_stations)
-            _, prev_station = dab_stations[prev_index]
-            radio_data['station_name'] = prev_station
-            radio_data['rds_text'] = f"DAB: {prev_station}"
-    
-    logger.info(f"Tuned to {radio_data['station_name']}")
-    socketio.emit('radio_update', radio_data)
+    seek_station(-1)
 
 @socketio.on('toggle_night_mode')
 def handle_night_mode():
@@ -277,90 +319,110 @@ def handle_balance(data):
     socketio.emit('audio_update', audio_settings)
 
 def update_vehicle_data():
-    """Background thread to simulate vehicle data updates."""
-    last_update = time.time()
+    """Background task to simulate vehicle data updates."""
+    # Bind the random functions to locals once for the whole loop; the
+    # integer steps are scaled from random() rather than using randint(),
+    # which goes through several Python-level calls per draw
+    rand = random.random
+    uniform = random.uniform
+    choice = random.choice
+    
+    # Values as last broadcast; ticks only carry the keys that differ from
+    # these, and clients get the full data on connect
+    last_vehicle = dict(vehicle_data)
+    last_radio = dict(radio_data)
     
     while True:
-        # Only update every 500ms
-        current_time = time.time()
-        if current_time - last_update >= 0.5:
-            try:
-                # Simulate speed changes (with some randomness)
-                vehicle_data['speed'] += random.randint(-3, 3)
-                vehicle_data['speed'] = max(0, min(120, vehicle_data['speed']))
-                
-                # Simulate RPM changes based on speed
-                target_rpm = vehicle_data['speed'] * 30 + 800  # Simplified RPM calculation
-                vehicle_data['rpm'] += (target_rpm - vehicle_data['rpm']) // 10
-                vehicle_data['rpm'] = max(800, min(6000, vehicle_data['rpm']))
-                
-                # Gradually decrease fuel level
-                if random.random() < 0.01:  # 1% chance per iteration
-                    vehicle_data['fuel_level'] -= 0.1
-                    vehicle_data['fuel_level'] = max(0, vehicle_data['fuel_level'])
-                
-                # Simulate coolant temperature fluctuations
-                vehicle_data['coolant_temp'] += random.randint(-1, 1)
-                vehicle_data['coolant_temp'] = max(80, min(105, vehicle_data['coolant_temp']))
-                
-                # Simulate outside temperature changes
-                if random.random() < 0.05:  # 5% chance per iteration
-                    vehicle_data['outside_temp'] += random.uniform(-0.1, 0.1)
-                    vehicle_data['outside_temp'] = round(vehicle_data['outside_temp'], 1)
-                
-                # Update the time
-                vehicle_data['time'] = datetime.now().strftime('%H:%M')
-                
-                # Emit the updated data
-                socketio.emit('vehicle_update', vehicle_data)
-                
-                # Update radio signal strength occasionally
-                if random.random() < 0.1:  # 10% chance per iteration
-                    radio_data['signal_strength'] += random.randint(-5, 5)
-                    radio_data['signal_strength'] = max(0, min(100, radio_data['signal_strength']))
-                    socketio.emit('radio_update', radio_data)
-                
-                # Update RDS text occasionally
-                if random.random() < 0.05 and radio_data['mode'] == 'FM':  # 5% chance per iteration
-                    rds_texts = [
-                        f"You're listening to {radio_data['station_name']}",
-                        f"{radio_data['station_name']} - Your Music Station",
-                        "Text us at 12345",
-                        "Follow us on social media",
-                        f"{radio_data['station_name']} - No commercials"
-                    ]
-                    radio_data['rds_text'] = random.choice(rds_texts)
-                    socketio.emit('radio_update', radio_data)
-                
-                last_update = current_time
-                
-            except Exception as e:
-                logger.error(f"Error updating vehicle data: {e}")
+        try:
+            # Simulate speed changes (with some randomness)
+            vehicle_data['speed'] += int(rand() * 7) - 3  # -3..3
+            vehicle_data['speed'] = max(0, min(120, vehicle_data['speed']))
+            
+            # Simulate RPM changes based on speed
+            target_rpm = vehicle_data['speed'] * 30 + 800  # Simplified RPM calculation
+            vehicle_data['rpm'] += (target_rpm - vehicle_data['rpm']) // 10
+            vehicle_data['rpm'] = max(800, min(6000, vehicle_data['rpm']))
+            
+            # Gradually decrease fuel level
+            if rand() < 0.01:  # 1% chance per iteration
+                vehicle_data['fuel_level'] -= 0.1
+                vehicle_data['fuel_level'] = max(0, vehicle_data['fuel_level'])
             
-        # Sleep to avoid CPU spike
-        time.sleep(0.1)
-
-# Flask 2.0+ doesn't have before_first_request anymore
-# Use this pattern instead
-@app.before_request
-def start_background_thread_check():
-    """Start the background thread for data updates (if needed)."""
-    if not hasattr(app, 'background_started'):
-        app.background_started = True
-        thread = threading.Thread(target=update_vehicle_data)
-        thread.daemon = True
-        thread.start()
+            # Simulate coolant temperature fluctuations
+            vehicle_data['coolant_temp'] += int(rand() * 3) - 1  # -1..1
+            vehicle_data['coolant_temp'] = max(80, min(105, vehicle_data['coolant_temp']))
+            
+            # Simulate outside temperature changes
+            if rand() < 0.05:  # 5% chance per iteration
+                vehicle_data['outside_temp'] += uniform(-0.1, 0.1)
+                vehicle_data['outside_temp'] = round(vehicle_data['outside_temp'], 1)
+            
+            # Update the time
+            vehicle_data['time'] = current_time_hm()
+            
+            # Everything that changed in this tick goes out in one event
+            tick = {}
+            
+            # Update radio signal strength occasionally
+            if rand() < 0.1:  # 10% chance per iteration
+                radio_data['signal_strength'] += int(rand() * 11) - 5  # -5..5
+                radio_data['signal_strength'] = max(0, min(100, radio_data['signal_strength']))
+            
+            # Update RDS text occasionally
+            if rand() < 0.05 and radio_data['mode'] == 'FM':  # 5% chance per iteration
+                rds_texts = [
+                    f"You're listening to {radio_data['station_name']}",
+                    f"{radio_data['station_name']} - Your Music Station",
+                    "Text us at 12345",
+                    "Follow us on social media",
+                    f"{radio_data['station_name']} - No commercials"
+                ]
+                radio_data['rds_text'] = choice(rds_texts)
+            
+            # The random changes are often zero, so compare the values
+            vehicle = {k: v for k, v in vehicle_data.items() if last_vehicle[k] != v}
+            if vehicle:
+                last_vehicle.update(vehicle)
+                tick['vehicle'] = vehicle
+            
+            radio = {k: v for k, v in radio_data.items() if last_radio[k] != v}
+            if radio:
+                last_radio.update(radio)
+                tick['radio'] = radio
+            
+            if tick:
+                socketio.emit('tick', tick)
+            
+        except Exception as e:
+            logger.error(f"Error updating vehicle data: {e}")
+        
+        # Let the Socket.IO async mode do the waiting until the next update
+        socketio.sleep(0.5)
+
+# The simulation task is started by the first client connection or __main__
+_simulation_lock = threading.Lock()
+_simulation_started = False
+
+def start_simulation():
+    """Start the simulated data background task, if it isn't running yet."""
+    global _simulation_started
+    with _simulation_lock:
+        if _simulation_started:
+            return
+        _simulation_started = True
+    
+    socketio.start_background_task(update_vehicle_data)
 
 if __name__ == '__main__':
-    # Create templates directory if it doesn't exist
-    if not os.path.exists('templates'):
-        os.makedirs('templates')
+    # Create directories if they don't exist (one mkdir call each)
+    for directory in ('templates', 'static'):
+        os.makedirs(directory, exist_ok=True)
     
-    # Create static directory if it doesn't exist
-    if not os.path.exists('static'):
-        os.makedirs('static')
+    # Start background task for simulated data right away, instead of on
+    # the first client connection (the reloader is disabled below)
+    start_simulation()
     
     # Update static files from existing UI design
-    # Start the Flask app
-    logger.info("Starting BMW iD6 Web Interface")
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True, use_reloader=False, log_output=True)
\ No newline at end of file
+    # Start the Flask app, without the debugger and per-request logging
+    logger.info(f"Starting BMW iD6 Web Interface ({async_mode} mode)")
+    socketio.run(app, host='0.0.0.0', port=5000, debug=False, use_reloader=False, log_output=False)
\ No newline at end of file